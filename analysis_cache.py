@@ -0,0 +1,141 @@
+"""Result cache for video analyses, keyed by upload content.
+
+Streamlit reruns the script on every widget change, so pressing "Analyze
+Video" again after only touching the resources/location/people inputs would
+decode the same clip from scratch. Results are cached under a SHA-256 of the
+uploaded bytes plus the sampling parameters and the analysis version, in a
+bounded in-memory LRU and, optionally, as JSON files in a directory that
+survives restarts.
+"""
+import collections
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from analysis_params import ANALYSIS_VERSION
+
+CHUNK_SIZE = 1 << 20
+DEFAULT_MAX_ENTRIES = 64
+
+logger = logging.getLogger("emergency.cache")
+
+
+def content_hash(upload):
+    """SHA-256 hex digest of a file-like object, read in chunks."""
+    digest = hashlib.sha256()
+    getvalue = getattr(upload, "getvalue", None)
+    if getvalue is not None:
+        # BytesIO / Streamlit UploadedFile: getvalue() returns the bytes the
+        # object was created from, while getbuffer() would copy them first
+        digest.update(getvalue())
+    else:
+        upload.seek(0)
+        for chunk in iter(lambda: upload.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+        upload.seek(0)
+    return digest.hexdigest()
+
+
+def upload_id(upload):
+    """Identity of a Streamlit upload, stable across reruns."""
+    return getattr(upload, "file_id", None) or f"{upload.name}:{upload.size}"
+
+
+def cache_key(upload, **params):
+    """Key for an analysis of ``upload`` with the given sampling parameters
+    by this version of the analysis (``ANALYSIS_VERSION``)."""
+    params = {**params, "version": ANALYSIS_VERSION}
+    suffix = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+    return f"{content_hash(upload)}-{suffix}"
+
+
+class AnalysisCache:
+    """Thread-safe LRU of analysis results with optional disk persistence."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached result for ``key`` or ``None``."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        result = self._load(key)
+        if result is not None:
+            self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        self._remember(key, result)
+        self._store(key, result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # mark as recently used for disk eviction
+        return result
+
+    def _store(self, key, result):
+        if not self.directory:
+            return
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except OSError:
+            # A full or read-only disk only costs the restart persistence:
+            # the result stays in the in-memory LRU
+            logger.exception("Could not persist analysis %s to %s", key, self.directory)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
@@ -0,0 +1,13 @@
+"""Exceptions shared by the analysis modules.
+
+Kept free of OpenCV/NumPy imports so the app can catch them even when those
+packages failed to import.
+"""
+
+
+class AnalysisError(Exception):
+    """A video could not be analysed (unreadable, empty, unsupported codec)."""
+
+
+class QueueFull(AnalysisError):
+    """Too many analyses are queued or running; try again later."""
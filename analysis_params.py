@@ -0,0 +1,53 @@
+"""Analysis settings and their defaults, without the video dependencies.
+
+The page needs the parameters an analysis result depends on on every rerun
+after an upload (they key the result in session state and in the cache).
+They only read environment variables, so they live here and importing them
+never pulls in OpenCV or NumPy on the script thread.
+"""
+import os
+
+# Part of every cache key, so results persisted in $ANALYSIS_CACHE_DIR by an
+# older release are not served after an upgrade: bump it whenever a change
+# can alter a result for the same video and parameters (features,
+# thresholds, sampling plans, the result's fields)
+ANALYSIS_VERSION = 2
+
+SAMPLE_COUNT = 15
+
+STRATEGIES = ("auto", "seek", "sequential")
+DEFAULT_STRATEGY = os.environ.get("FRAME_SAMPLER_STRATEGY", "auto")
+
+ENGINES = ("adaptive", "batch", "loop")
+DEFAULT_ENGINE = os.environ.get("ANALYSIS_ENGINE", "adaptive")
+
+# "full": features over the whole frame; "thumbnail": over a 160x120
+# area-averaged thumbnail of it
+FEATURE_MODES = ("full", "thumbnail")
+DEFAULT_FEATURES = os.environ.get("ANALYSIS_FEATURES", "full")
+
+# "diff": motion between consecutive samples; "flow": shake vs. local motion
+# between each sample and the frame right after it
+MOTION_MODES = ("diff", "flow")
+DEFAULT_MOTION = os.environ.get("ANALYSIS_MOTION", "diff")
+
+# "frame": whole-frame averages; "tiles": per-tile indicators and a heatmap
+REGION_MODES = ("frame", "tiles")
+DEFAULT_REGIONS = os.environ.get("ANALYSIS_REGIONS", "frame")
+
+BACKENDS = ("auto", "ffmpeg", "pyav")
+DEFAULT_BACKEND = os.environ.get("DECODE_BACKEND", "auto")
+
+
+def sampling_params(count=SAMPLE_COUNT, strategy=None, engine=None, motion=None, regions=None, backend=None,
+                    features=None):
+    """The parameters an analysis result depends on (part of its cache key)."""
+    return {
+        "count": count,
+        "strategy": strategy or DEFAULT_STRATEGY,
+        "engine": engine or DEFAULT_ENGINE,
+        "motion": motion or DEFAULT_MOTION,
+        "regions": regions or DEFAULT_REGIONS,
+        "backend": backend or DEFAULT_BACKEND,
+        "features": features or DEFAULT_FEATURES,
+    }
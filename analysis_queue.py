@@ -0,0 +1,110 @@
+"""Local worker pool for video analyses, with backpressure.
+
+By default analyses run on threads of the Streamlit process (OpenCV releases
+the GIL while decoding). With ``ANALYSIS_WORKER_MODE=process`` decoding and
+feature extraction run in a pool of ``ANALYSIS_WORKERS`` worker processes
+instead, so simultaneous uploads use every core. Either way at most
+``ANALYSIS_QUEUE_SIZE`` analyses are queued or running at once; ``submit``
+raises ``QueueFull`` beyond that rather than letting the backlog grow.
+
+``analysis_runner.start_analysis`` only uses ``submit``, ``run`` and
+``channel``, so anything with those three methods can stand in for
+``AnalysisQueue`` (e.g. a queue that runs every job inline).
+"""
+import multiprocessing
+import os
+import threading
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from analysis_errors import AnalysisError, QueueFull
+
+MODES = ("thread", "process")
+DEFAULT_MODE = os.environ.get("ANALYSIS_WORKER_MODE", "thread")
+DEFAULT_WORKERS = int(os.environ.get("ANALYSIS_WORKERS") or 0) or os.cpu_count() or 1
+DEFAULT_QUEUE_SIZE = int(os.environ.get("ANALYSIS_QUEUE_SIZE") or 0) or 2 * DEFAULT_WORKERS
+
+
+class AnalysisQueue:
+    """A bounded queue of analyses in front of thread or process workers."""
+
+    def __init__(self, workers=None, mode=None, max_pending=None):
+        self.mode = mode or DEFAULT_MODE
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown worker mode: {self.mode!r}")
+        self.workers = workers or DEFAULT_WORKERS
+        self.max_pending = max_pending or (2 * workers if workers else DEFAULT_QUEUE_SIZE)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._processes = None
+        self._manager = None
+        if self.mode == "process":
+            # Not fork: the Streamlit server is multi-threaded
+            self._context = multiprocessing.get_context("spawn")
+            self._processes = ProcessPoolExecutor(self.workers, mp_context=self._context)
+            self._manager = self._context.Manager()
+            # Front-end threads only look up the cache and wait on a worker
+            self._threads = ThreadPoolExecutor(self.max_pending, thread_name_prefix="analysis")
+        else:
+            self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix="analysis")
+
+    @property
+    def pending(self):
+        """Analyses queued or running."""
+        return self._pending
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, fn, *args):
+        """Schedule ``fn(*args)`` on a front-end thread; return its future.
+
+        Raises ``QueueFull`` when ``max_pending`` analyses are already queued
+        or running.
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self._pending} analyses are already queued or running")
+            self._pending += 1
+        try:
+            future = self._threads.submit(fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn, *args):
+        """Run the heavy part of a job: inline on thread workers, or in a
+        worker process (``fn`` and ``args`` must then be picklable)."""
+        if self._processes is None:
+            return fn(*args)
+        pool = self._processes
+        try:
+            return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            # A worker died (e.g. a decoder crash): replace the pool so later
+            # analyses still run
+            with self._lock:
+                if self._processes is pool:
+                    self._processes = ProcessPoolExecutor(self.workers, mp_context=self._context)
+            raise AnalysisError("the analysis worker crashed") from None
+
+    def channel(self):
+        """``(frames_done, planned, cancelled)`` shared between a job and its worker.
+
+        ``frames_done.value`` is the progress, ``planned.value`` the number
+        of frames the engine currently plans to sample, ``cancelled`` an
+        ``Event``.
+        """
+        if self._manager is None:
+            return types.SimpleNamespace(value=0), types.SimpleNamespace(value=0), threading.Event()
+        return self._manager.Value("i", 0), self._manager.Value("i", 0), self._manager.Event()
+
+    def shutdown(self):
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
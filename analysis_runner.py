@@ -0,0 +1,135 @@
+"""Background video analysis with progress reporting and cancellation.
+
+The Streamlit script thread only submits a job and polls its progress; the
+decode runs on a shared ``analysis_queue.AnalysisQueue`` (worker threads, or
+worker processes in the multi-worker deployment mode).
+"""
+import io
+import time
+
+import telemetry
+from analysis_cache import cache_key
+from analysis_errors import QueueFull
+from analysis_params import SAMPLE_COUNT, sampling_params
+from video_analysis import analyze_file, analyze_upload
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside a job's worker once the job has been cancelled."""
+
+
+class FrameReporter:
+    """Progress callback for ``analyze_upload``, picklable for worker processes."""
+
+    def __init__(self, file_id, frames_done, planned, cancelled):
+        self.file_id = file_id
+        self.frames_done = frames_done
+        self.planned = planned
+        self.cancelled = cancelled
+
+    def __call__(self, frames_done, planned=None):
+        if self.cancelled.is_set():
+            raise AnalysisCancelled(self.file_id)
+        if planned is not None:
+            self.planned.value = planned
+        self.frames_done.value = frames_done
+
+
+class AnalysisJob:
+    """Handle for one analysis submitted to an analysis queue."""
+
+    def __init__(self, file_id, total, channel):
+        self.file_id = file_id
+        self.future = None
+        self.submitted = time.perf_counter()
+        self.on_frame = FrameReporter(file_id, *channel)
+        self.on_frame.planned.value = total
+
+    @property
+    def frames_done(self):
+        return self.on_frame.frames_done.value
+
+    @property
+    def total(self):
+        """Frames the analysis plans to sample; grows if the adaptive engine
+        starts another pass."""
+        return self.on_frame.planned.value
+
+    @property
+    def progress(self):
+        """Fraction of the planned sample frames processed, 0.0 to 1.0."""
+        if self.future is not None and self.future.done():
+            return 1.0
+        return min(1.0, self.frames_done / self.total) if self.total else 0.0
+
+    @property
+    def cancelled(self):
+        return self.on_frame.cancelled.is_set()
+
+    def cancel(self):
+        """Stop the analysis at the next sampled frame."""
+        self.on_frame.cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+def _analyze(source, name, count, strategy, progress):
+    # Module level so worker processes can unpickle it
+    if isinstance(source, str):
+        return analyze_file(source, count, strategy, progress=progress)
+    return analyze_upload(io.BytesIO(source), count, strategy, name=name, progress=progress)
+
+
+def _opened(source):
+    return open(source, "rb") if isinstance(source, str) else io.BytesIO(source)
+
+
+def _run(job, queue, cache, source, size, name, count, strategy):
+    telemetry.observe("queue_wait", (time.perf_counter() - job.submitted) * 1000)
+    with telemetry.stage("cache_lookup"), _opened(source) as upload:
+        key = cache_key(upload, **sampling_params(count, strategy))
+        result = cache.get(key)
+    if result is not None:
+        telemetry.count("cache_hits_total")
+        return result
+    telemetry.count("cache_misses_total")
+    result = queue.run(_analyze, source, name, count, strategy, job.on_frame)
+    cache.put(key, result)
+    telemetry.record_analysis(result, upload_bytes=size, cache="miss")
+    return result
+
+
+def start_analysis(queue, cache, upload, file_id, count=SAMPLE_COUNT, strategy=None):
+    """Submit an analysis of ``upload`` to ``queue`` and return its job.
+
+    The worker reads the upload's bytes through its own file object, so the
+    script thread can keep reading ``upload`` (e.g. for ``st.video``)
+    meanwhile. Those bytes are not copied: ``getvalue()`` of an unmodified
+    ``BytesIO`` (which Streamlit uploads are) is the very bytes object it
+    holds. Only process workers get a copy, when the job is pickled. Uploads
+    stored on disk (``upload_store.StoredUpload``) are analysed from their
+    file instead and never read into memory. Raises ``QueueFull`` if the
+    queue has no room for another analysis.
+    """
+    job = AnalysisJob(file_id, count, queue.channel())
+    source = getattr(upload, "path", None)
+    if source is None:
+        source = upload.getvalue()
+        size = len(source)
+    else:
+        size = upload.size
+    telemetry.count("upload_bytes_total", size)
+    try:
+        job.future = queue.submit(
+            _run, job, queue, cache, source, size, getattr(upload, "name", None), count, strategy
+        )
+    except QueueFull:
+        telemetry.count("queue_full_total")
+        raise
+    return job
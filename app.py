@@ -1 +1,21 @@
+"""Entry point: ``streamlit run app.py``.
 
+Starts warming OpenCV/NumPy in the background once per server process, then
+runs the app script (``app_fixed.py``) on every Streamlit rerun. The script
+is compiled once per process (``warmup.compiled``) and executed in a fresh
+namespace each time.
+"""
+import os
+
+import warmup
+
+# Streamlit makes this script ``__main__``, so the spawned worker processes of
+# ``ANALYSIS_WORKER_MODE=process`` (and their manager) import it again as
+# ``__mp_main__``: they must not render the page or bind the upload port.
+# The page runs under its own name for the same reason: as ``__main__`` it
+# would be the script the workers import
+if __name__ != "__mp_main__":
+    warmup.start()
+
+    _page = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_fixed.py")
+    exec(warmup.compiled(_page), {"__name__": "app_fixed", "__file__": _page, "__builtins__": __builtins__})
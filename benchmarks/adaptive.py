@@ -0,0 +1,33 @@
+"""Frames decoded per clip: fixed 15-frame sampling vs. the adaptive engine.
+
+    python -m benchmarks.adaptive
+"""
+import statistics
+
+from benchmarks.synthetic import EXPECTED, cached_clip
+from video_analysis import analyze_file
+
+CLIP_LENGTHS = (300, 3000)
+
+
+def main():
+    rows = {"loop": [], "adaptive": []}
+    print(f"{'clip':<22}{'expected':>14}" + "".join(f"{e + ' (dec/smp)':>30}" for e in rows))
+    for frames in CLIP_LENGTHS:
+        for scene, expected in EXPECTED.items():
+            path = cached_clip(f"{scene}_{frames}.mp4", frames, scene=scene)
+            line = f"{scene + ' ' + str(frames):<22}{expected:>14}"
+            for engine, results in rows.items():
+                result = analyze_file(path, engine=engine)
+                results.append(result)
+                cell = f"{result['situation']} {result['frames_decoded']}/{result['counters']['frame_count']}"
+                line += f"{cell:>30}"
+            print(line)
+    for engine, results in rows.items():
+        decoded = statistics.mean(r["frames_decoded"] for r in results)
+        sampled = statistics.mean(r["counters"]["frame_count"] for r in results)
+        print(f"{engine:<10} mean frames decoded {decoded:8.1f}, sampled {sampled:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Decode backends compared on CPU-only hardware.
+
+Runs the same analysis over each available backend (OpenCV's default, the
+FFmpeg backend at several decoder thread counts, and PyAV if installed) and
+reports the median wall and decode time, frames decoded, the stream
+metadata each backend reports and whether the situation matches the
+default backend's.
+
+    python -m benchmarks.decoders [--repeat 3]
+"""
+import argparse
+import importlib.util
+import os
+import statistics
+import time
+
+from benchmarks.synthetic import cached_clip
+from decode_backend import open_capture
+from video_analysis import analyze_capture
+
+CLIPS = {
+    # name: (frames at 30 fps, size, fourcc, file name)
+    "360p mp4v (30 s)": (900, (640, 360), "mp4v", "decoders_360p.mp4"),
+    "1080p mp4v (30 s)": (900, (1920, 1080), "mp4v", "decoders_1080p.mp4"),
+    "1080p MJPG (30 s)": (900, (1920, 1080), "MJPG", "decoders_1080p.avi"),
+}
+
+
+def configurations():
+    yield "auto", None
+    for threads in sorted({1, 2, os.cpu_count() or 1}):
+        yield "ffmpeg", threads
+    if importlib.util.find_spec("av") is not None:
+        yield "pyav", None
+
+
+def run(path, backend, threads, repeat):
+    wall, decode = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cap = open_capture(path, backend, threads)
+        try:
+            result = analyze_capture(cap, path=path, engine="loop")
+        finally:
+            cap.release()
+        wall.append((time.perf_counter() - start) * 1000)
+        decode.append(result["timings"]["decode_ms"])
+    return result, statistics.median(wall), statistics.median(decode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'clip':<20}{'backend':<12}{'wall ms':>9}{'decode ms':>11}{'decoded':>9}{'fps':>7}{'gop':>6}  situation")
+    for label, (frames, size, fourcc, name) in CLIPS.items():
+        path = cached_clip(name, frames, size=size, fourcc=fourcc)
+        reference = None
+        for backend, threads in configurations():
+            result, wall_ms, decode_ms = run(path, backend, threads, args.repeat)
+            reference = reference or result["situation"]
+            stream = result["stream"]
+            gop = "-" if stream["keyframe_interval"] is None else round(stream["keyframe_interval"])
+            config = backend if threads is None else f"{backend}x{threads}"
+            flag = "" if result["situation"] == reference else "  (differs)"
+            print(f"{label:<20}{config:<12}{wall_ms:>9.1f}{decode_ms:>11.1f}{result['frames_decoded']:>9}"
+                  f"{stream['fps']:>7.1f}{gop:>6}  {result['situation']}{flag}")
+
+
+if __name__ == "__main__":
+    main()
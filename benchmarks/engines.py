@@ -0,0 +1,55 @@
+"""Stacked (batch) engine vs. the per-frame loop.
+
+Checks that both engines produce identical counters on the reference clip
+set, in both feature modes, at the default 15 samples and at higher sample
+counts, and prints the feature time of each. Exits non-zero on any
+difference.
+
+    python -m benchmarks.engines
+"""
+import sys
+import time
+
+import cv2
+
+from analysis_params import FEATURE_MODES
+from benchmarks.synthetic import EXPECTED, cached_clip
+from frame_sampler import sample_frames
+from video_analysis import classify, count_signals, count_signals_batch
+
+SAMPLE_COUNTS = (15, 60, 150)
+FRAMES = 300
+
+
+def decoded(path, count):
+    cap = cv2.VideoCapture(path)
+    frames = list(sample_frames(cap, count, path=path))
+    cap.release()
+    return frames
+
+
+def timed(count, frames):
+    start = time.perf_counter()
+    counters = count(frames)
+    return counters, (time.perf_counter() - start) * 1000
+
+
+def main():
+    mismatches = 0
+    print(f"{'clip':<16}{'features':>10}{'samples':>8}{'situation':>14}{'loop ms':>10}{'batch ms':>10}")
+    for scene in EXPECTED:
+        path = cached_clip(f"{scene}_engines.mp4", FRAMES, scene=scene)
+        for count in SAMPLE_COUNTS:
+            frames = decoded(path, count)
+            for features in FEATURE_MODES:
+                loop, loop_ms = timed(lambda f: count_signals(f, features=features), frames)
+                batch, batch_ms = timed(lambda f: count_signals_batch(f, count, features=features), frames)
+                mismatches += loop != batch
+                flag = "" if loop == batch else f"  MISMATCH {loop} != {batch}"
+                print(f"{scene:<16}{features:>10}{count:>8}{classify(batch)[0]:>14}{loop_ms:>10.2f}{batch_ms:>10.2f}"
+                      f"{flag}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Frame features vs. the original full-resolution loop.
+
+``--check`` runs them on a reference set of synthetic clips (one per
+situation) at several resolutions up to 4K and exits non-zero if the
+thumbnail features decide any clip differently, or if the full features
+give any sampled frame a different water, fire, dark or motion flag, also
+on ``BORDERLINE`` scenes whose averages sit right at a per-frame threshold
+under pixel-sized texture. Without it, prints the decisions and feature
+time per clip for the reference scenes.
+
+    python -m benchmarks.features --check
+    python -m benchmarks.features
+"""
+import argparse
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import BORDERLINE, EXPECTED, cached_clip
+from frame_features import FeatureExtractor, ThumbnailFeatureExtractor, frame_indicators
+from frame_sampler import SAMPLE_COUNT, sample_frames
+from video_analysis import classify, count_signals
+
+RESOLUTIONS = {"360p": (640, 360), "1080p": (1920, 1080), "4k": (3840, 2160)}
+FRAMES = 90
+INDICATORS = ("water", "fire", "dark", "moving")
+
+
+def legacy_flags(frames):
+    """Per-frame ``(water, fire, dark, moving)`` of the sidebar loop as it was,
+    at full resolution."""
+    flags = []
+    prev_frame = None
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        avg_color = np.mean(frame, axis=(0, 1))
+        brightness = np.mean(avg_color)
+        brown_muddy = (avg_color[0] > avg_color[2] and avg_color[1] > avg_color[2])
+        blue_ratio = avg_color[0] / (np.sum(avg_color) + 1)
+        water = brown_muddy or blue_ratio > 0.4 or (brightness > 100 and blue_ratio > 0.3)
+        red_ratio = avg_color[2] / (np.sum(avg_color) + 1)
+        fire = red_ratio > 0.4 and brightness > 70
+        dark = brightness < 45
+        moving = prev_frame is not None and np.mean(cv2.absdiff(prev_frame, gray)) > 25
+        prev_frame = gray.copy()
+        flags.append((bool(water), bool(fire), bool(dark), bool(moving)))
+    return flags
+
+
+def legacy_counters(frames):
+    counters = {"frame_count": 0, "blue_frames": 0, "red_frames": 0, "dark_frames": 0, "motion_frames": 0}
+    for water, fire, dark, moving in legacy_flags(frames):
+        counters["blue_frames"] += water
+        counters["red_frames"] += fire
+        counters["dark_frames"] += dark
+        counters["motion_frames"] += moving
+        counters["frame_count"] += 1
+    return counters
+
+
+def extractor_flags(frames):
+    extract = FeatureExtractor()
+    return [tuple(bool(flag) for flag in frame_indicators(*extract(frame))) for frame in frames]
+
+
+def decoded(path):
+    cap = cv2.VideoCapture(path)
+    frames = list(sample_frames(cap, SAMPLE_COUNT, path=path))
+    cap.release()
+    return frames
+
+
+def clips(scenes):
+    for res_name, size in RESOLUTIONS.items():
+        for scene in scenes:
+            yield f"{scene} {res_name}", decoded(cached_clip(f"{scene}_{res_name}.mp4", FRAMES, size=size, scene=scene))
+
+
+def timed(count, frames):
+    start = time.perf_counter()
+    counters = count(frames)
+    return counters, time.perf_counter() - start
+
+
+def check():
+    mismatches = frames_checked = 0
+    for name, frames in clips([*EXPECTED, *BORDERLINE]):
+        for i, (old, new) in enumerate(zip(legacy_flags(frames), extractor_flags(frames))):
+            frames_checked += 1
+            if old != new:
+                mismatches += 1
+                changed = [label for label, a, b in zip(INDICATORS, old, new) if a != b]
+                print(f"MISMATCH {name} frame {i}: {', '.join(changed)}")
+    print(f"{frames_checked} frames, {mismatches} mismatches")
+    decisions = changed = 0
+    for name, frames in clips(EXPECTED):
+        decisions += 1
+        old = classify(legacy_counters(frames))[0]
+        new = classify(count_signals(frames, ThumbnailFeatureExtractor()))[0]
+        if old != new:
+            changed += 1
+            print(f"MISMATCH {name}: thumbnail features decide {new}, the loop {old}")
+    print(f"{decisions} thumbnail decisions, {changed} mismatches")
+    return mismatches + changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only compare per-frame flags; exit 1 on any difference")
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(1 if check() else 0)
+
+    print(f"{'clip':<22}{'expected':>14}{'legacy':>14}{'full':>14}{'thumbnail':>14}"
+          f"{'legacy ms':>12}{'full ms':>10}{'thumb ms':>10}")
+    for name, frames in clips(EXPECTED):
+        old, old_time = timed(legacy_counters, frames)
+        full, full_time = timed(lambda f: count_signals(f, FeatureExtractor()), frames)
+        thumb, thumb_time = timed(lambda f: count_signals(f, ThumbnailFeatureExtractor()), frames)
+        print(f"{name:<22}{EXPECTED[name.split()[0]]:>14}{classify(old)[0]:>14}{classify(full)[0]:>14}"
+              f"{classify(thumb)[0]:>14}{old_time * 1000:>12.1f}{full_time * 1000:>10.1f}{thumb_time * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
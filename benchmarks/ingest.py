@@ -0,0 +1,118 @@
+"""Peak RSS of upload ingestion: read()+temp file vs. streaming.
+
+Each path runs in its own child process with the upload already held in a
+BytesIO (as Streamlit does) and reports how far ``ru_maxrss`` rose while the
+clip was opened and its 15 sample frames decoded, and how many of the
+upload's bytes were read.
+
+    python -m benchmarks.ingest [--frames 6000]
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+import cv2
+
+from benchmarks.synthetic import cached_clip
+from frame_sampler import SAMPLE_COUNT, sample_frames
+from video_analysis import count_signals
+from video_ingest import open_upload, spool_to_file
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def legacy(upload):
+    """The original sidebar path."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp_file:
+        tmp_file.write(upload.read())
+        video_path = tmp_file.name
+    cap = cv2.VideoCapture(video_path)
+    count_signals(sample_frames(cap, SAMPLE_COUNT, path=video_path))
+    cap.release()
+    os.unlink(video_path)
+
+
+def streamed(upload):
+    with open_upload(upload, "clip.mp4") as cap:
+        count_signals(sample_frames(cap, SAMPLE_COUNT, path="clip.mp4"))
+
+
+def spooled(upload):
+    path = spool_to_file(upload)
+    try:
+        cap = cv2.VideoCapture(path)
+        count_signals(sample_frames(cap, SAMPLE_COUNT, path=path))
+        cap.release()
+    finally:
+        os.unlink(path)
+
+
+def job(upload):
+    """The sidebar's background job (thread workers), including the cache lookup."""
+    from analysis_cache import AnalysisCache
+    from analysis_queue import AnalysisQueue
+    from analysis_runner import start_analysis
+
+    queue = AnalysisQueue(workers=1, mode="thread")
+    start_analysis(queue, AnalysisCache(), upload, "clip.mp4").result()
+    queue.shutdown()
+
+
+MODES = {"legacy": legacy, "open_upload": streamed, "chunked spool": spooled, "analysis job": job}
+
+
+class CountingUpload(io.BytesIO):
+    """An in-memory upload that counts the bytes read from it."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = super().readinto(buffer)
+        self.bytes_read += n
+        return n
+
+
+def child(mode, path):
+    with open(path, "rb") as f:
+        upload = CountingUpload(f.read())
+    cv2.VideoCapture().release()  # load the FFmpeg backend before measuring
+    before = peak_rss_mb()
+    MODES[mode](upload)
+    print(json.dumps({"before": before, "after": peak_rss_mb(), "read": upload.bytes_read}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=6000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    path = cached_clip(f"large_{args.frames}.mp4", args.frames, size=(1920, 1080))
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"upload: {size_mb:.0f} MB, OpenCV {cv2.__version__}")
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.ingest", "--child", mode, path],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        rss = json.loads(out)
+        print(f"{mode:<14} peak RSS +{rss['after'] - rss['before']:7.1f} MB, read {rss['read'] / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
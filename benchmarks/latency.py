@@ -0,0 +1,61 @@
+"""Analyze-button latency: old blocking path vs. background job + polling.
+
+The old path is ``time.sleep(1)`` followed by a synchronous decode in the
+script thread; the new one submits to an analysis queue and polls progress every
+100 ms the way the sidebar does.
+
+    python -m benchmarks.latency [--repeat 5]
+"""
+import argparse
+import statistics
+import time
+
+from analysis_cache import AnalysisCache
+from analysis_queue import AnalysisQueue
+from analysis_runner import start_analysis
+from benchmarks.synthetic import Upload, cached_clip
+from video_analysis import analyze_upload
+
+CLIPS = {"short (10 s)": ("short_mp4v.mp4", 300), "long (5 min)": ("long_mp4v.mp4", 9000)}
+
+
+def old_path(upload):
+    time.sleep(1)
+    analyze_upload(upload)
+
+
+def new_path(upload, queue):
+    # A fresh cache each time so the decode is measured, not a cache hit
+    job = start_analysis(queue, AnalysisCache(), upload, upload.name)
+    while not job.done():
+        time.sleep(0.1)
+    job.result()
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    queue = AnalysisQueue(workers=2, mode="thread")
+    print(f"{'clip':<16}{'old ms':>10}{'new ms':>10}")
+    for label, (name, frames) in CLIPS.items():
+        with open(cached_clip(name, frames), "rb") as f:
+            data = f.read()
+        old = median_ms(lambda: old_path(Upload(data, name)), args.repeat)
+        new = median_ms(lambda: new_path(Upload(data, name), queue), args.repeat)
+        print(f"{label:<16}{old:>10.0f}{new:>10.0f}")
+    queue.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+"""Load test: many simulated users of one app instance at once.
+
+Every simulated user is a headless AppTest session of ``app_fixed.py`` on
+its own thread, all in this one process, so they share the script's
+``st.cache_resource`` objects (the analysis queue and result cache) the way
+the sessions of a single deployed instance do. Each user repeatedly picks
+an action from a mix:
+
+- ``browse``: switch the language, disaster type or first-aid selectbox
+  and rerun the script
+- ``analyze``: upload a video, press Analyze and wait for the rerun that
+  renders the result
+
+AppTest cannot drive ``st.file_uploader``, so the uploader is replaced by
+one that returns the clip the session holds in ``st.session_state``. Every
+upload is distinct (always a cache miss). An analysis is timed from the
+click to the end of the rerun that shows it; one the queue turns away
+(the "busy" warning) counts as rejected, and that user waits
+``RETRY_AFTER`` seconds before going on.
+
+The report has p50/p95/p99 rerun and analysis latency, resident memory per
+session and throughput, for sizing instances (set ``ANALYSIS_WORKERS`` and
+``ANALYSIS_WORKER_MODE`` as on the instance):
+
+    python -m benchmarks.loadtest --users 40 --duration 60
+    python -m benchmarks.loadtest --mix browse=0.5,analyze=0.5 -o load.json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+from unittest.mock import MagicMock
+
+from benchmarks.rerun import SCRIPT, selectbox
+from benchmarks.synthetic import Upload, cached_clip
+
+ACTIONS = {
+    "browse": [
+        ("select your language :", ("hindi", "english")),
+        ("select type of disaster :", ("volcano", "floods", "ज्वालामुखी", "बाढ़", "None")),
+        ("Emergency type:", ("Cuts", "Burns", "Choking", "Heart Attack")),
+    ],
+}
+DEFAULT_MIX = "browse=0.9,analyze=0.1"
+CLIP_FRAMES = 900
+UPLOAD_KEY = "_loadtest_upload"
+ANALYZE = "🔍 Analyze Video"
+# Longest a single rerun may take, including waiting for a queued analysis
+RUN_TIMEOUT = 600
+# Seconds a user turned away by a full queue waits before the next action
+# (the chunked upload client honours the same Retry-After)
+RETRY_AFTER = 5
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        action, _, weight = part.partition("=")
+        if action not in ("browse", "analyze"):
+            raise argparse.ArgumentTypeError(f"unknown action {action!r}")
+        mix[action] = float(weight)
+    return mix
+
+
+def _event_runner():
+    """``LocalScriptRunner`` that returns as soon as its run has shut down.
+
+    AppTest's own runner checks for the end of the script every 100 ms,
+    which would put a 100 ms floor under every measured rerun, and can
+    return before the shutdown event it reads next is recorded when many
+    sessions compete for the CPU. It also compiles the script afresh for
+    every run; like the server, these share one compiled copy (concurrent
+    ``compile`` calls can fail on CPython 3.11).
+    """
+    from urllib import parse
+
+    from streamlit.runtime.scriptrunner import RerunData, ScriptRunnerEvent
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1.element_tree import parse_tree_from_messages
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    script_cache = ScriptCache()
+
+    class EventRunner(LocalScriptRunner):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._script_cache = script_cache
+            self._shut_down = threading.Event()
+            # Connected after the recorder, so the shutdown data is in first
+            self.on_event.connect(self._on_event, weak=False)
+
+        def _on_event(self, sender, event, **kwargs):
+            if event == ScriptRunnerEvent.SHUTDOWN:
+                self._shut_down.set()
+
+        def run(self, widget_state=None, query_params=None, timeout=3):
+            query_string = parse.urlencode(query_params, doseq=True) if query_params else ""
+            self.request_rerun(RerunData(widget_states=widget_state, query_string=query_string))
+            if not self._script_thread:
+                self.start()
+            if not self._shut_down.wait(timeout):
+                self.request_stop()
+                self.join()
+                raise RuntimeError(f"AppTest script run timed out after {timeout}s")
+            return parse_tree_from_messages(self.forward_msgs())
+
+    return EventRunner
+
+
+def install_harness():
+    """Prepare Streamlit for concurrent AppTest sessions in one process.
+
+    AppTest installs a mock runtime for each run and removes it afterwards;
+    with sessions running at the same time one would remove it under
+    another, so a single shared one is installed here instead. Runs wait
+    for their shutdown event (``_event_runner``), and the file uploader
+    returns the session's ``UPLOAD_KEY`` clip.
+    """
+    import streamlit as st
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import app_test
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    # With a runtime present, Streamlit warns about every call made outside a
+    # script run (the sessions' own threads setting widget state)
+    logging.getLogger("streamlit.runtime.scriptrunner.script_run_context").setLevel(logging.ERROR)
+    app_test.Runtime = type("Runtime", (), {})  # absorbs AppTest's per-run install/remove
+    app_test.LocalScriptRunner = _event_runner()
+    st.file_uploader = lambda *args, **kwargs: st.session_state.get(UPLOAD_KEY)
+
+
+def browse(at, rng):
+    boxes = {box.label: box for box in at.selectbox}
+    label, options = rng.choice([a for a in ACTIONS["browse"] if a[0] in boxes])
+    box = selectbox(at, label)
+    choices = [o for o in options if o in box.options] or box.options
+    start = time.perf_counter()
+    box.select(rng.choice(choices)).run(timeout=RUN_TIMEOUT)
+    return (time.perf_counter() - start) * 1000
+
+
+def analyze(at, upload):
+    """Upload, press Analyze; return ``(ms until the result is rendered, outcome)``."""
+    at.session_state[UPLOAD_KEY] = upload
+    at.run(timeout=RUN_TIMEOUT)
+    button = next((b for b in at.button if b.label == ANALYZE), None)
+    if button is None:
+        raise RuntimeError(f"no Analyze button after the upload rerun: {list(at.exception)}")
+    start = time.perf_counter()
+    button.click().run(timeout=RUN_TIMEOUT)
+    elapsed = (time.perf_counter() - start) * 1000
+    if any("Analysis Complete" in s.value for s in at.success):
+        return elapsed, "done"
+    if any("Many videos" in w.value for w in at.warning):
+        return elapsed, "rejected"
+    return elapsed, "failed"
+
+
+class Session(threading.Thread):
+    """One simulated user; keeps its raw samples."""
+
+    def __init__(self, index, clip, mix, seed):
+        super().__init__(name=f"session-{index}", daemon=True)
+        from streamlit.testing.v1 import AppTest
+
+        self.index, self.clip, self.mix = index, clip, mix
+        self.deadline = 0.0
+        self.rng = random.Random(seed + index)
+        self.at = AppTest.from_file(SCRIPT, default_timeout=RUN_TIMEOUT)
+        self.reruns, self.analyses = [], []
+        self.outcomes = {"done": 0, "rejected": 0, "failed": 0}
+        self.error = None
+
+    def run(self):
+        actions, weights = zip(*self.mix.items())
+        uploads = 0
+        try:
+            while time.perf_counter() < self.deadline:
+                if self.rng.choices(actions, weights)[0] == "analyze":
+                    uploads += 1
+                    # A distinct trailing byte pattern per upload: never a cache hit
+                    name = f"load_{self.index}_{uploads}.mp4"
+                    elapsed, outcome = analyze(self.at, Upload(self.clip + name.encode(), name))
+                    self.outcomes[outcome] += 1
+                    if outcome == "done":
+                        self.analyses.append(elapsed)
+                    elif outcome == "rejected":
+                        time.sleep(max(0.0, min(RETRY_AFTER, self.deadline - time.perf_counter())))
+                else:
+                    self.reruns.append(browse(self.at, self.rng))
+        except Exception as e:  # reported, so one broken session doesn't hide in the totals
+            self.error = e
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        return {"p50": samples[0] if samples else None, "p95": None, "p99": None}
+    cuts = statistics.quantiles(samples, n=100)
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="simulated sessions")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load after warm-up")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"default: {DEFAULT_MIX}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    install_harness()
+    with open(cached_clip("loadtest.mp4", CLIP_FRAMES), "rb") as f:
+        clip = f.read()
+    baseline = rss_mb()
+    sessions = [Session(i, clip, args.mix, args.seed) for i in range(args.users)]
+    for session in sessions:
+        session.at.run()
+    session_mb = (rss_mb() - baseline) / args.users
+
+    deadline = time.perf_counter() + args.duration
+    start = time.perf_counter()
+    for session in sessions:
+        session.deadline = deadline
+        session.start()
+    for session in sessions:
+        session.join()
+    elapsed = time.perf_counter() - start
+
+    reruns = [ms for s in sessions for ms in s.reruns]
+    analyses = [ms for s in sessions for ms in s.analyses]
+    outcomes = {k: sum(s.outcomes[k] for s in sessions) for k in ("done", "rejected", "failed")}
+    errors = [f"{s.name}: {s.error!r}" for s in sessions if s.error is not None]
+    report = {
+        "users": args.users,
+        "duration_s": elapsed,
+        "mix": args.mix,
+        "reruns": len(reruns),
+        "reruns_per_s": len(reruns) / elapsed,
+        "rerun_ms": percentiles(reruns),
+        "analyses": len(analyses),
+        "analyses_per_s": len(analyses) / elapsed,
+        "analysis_ms": percentiles(analyses),
+        "rejected": outcomes["rejected"],
+        "failed": outcomes["failed"],
+        "session_mb": session_mb,
+        "process_mb": rss_mb(),
+        "errors": errors,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    def fmt(stats):
+        return "  ".join(f"{k} {'-' if v is None else f'{v:.0f}'} ms" for k, v in stats.items())
+
+    print(f"{args.users} users for {elapsed:.0f} s, mix {args.mix}")
+    print(f"reruns:   {len(reruns)} ({report['reruns_per_s']:.1f}/s)  {fmt(report['rerun_ms'])}")
+    print(f"analyses: {len(analyses)} ({report['analyses_per_s']:.2f}/s)  {fmt(report['analysis_ms'])}"
+          f"  ({outcomes['rejected']} rejected: queue full, {outcomes['failed']} failed)")
+    print(f"memory:   {session_mb:.1f} MB per session, {report['process_mb']:.0f} MB process")
+    for error in errors:
+        print(f"error:    {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Rule-table recommendations vs. the original sidebar branches.
+
+``legacy`` is the ``if``/``elif`` code the sidebar ran before the rule table
+(``recommendations.RULES``), kept verbatim apart from writing to a recorder
+instead of ``st``. Every situation x location x resource set from
+``recommendations.all_plans()`` is rendered both ways, for a few group sizes,
+and compared line by line; the time per lookup of each is printed. Exits
+non-zero on any difference.
+
+    python -m benchmarks.plans
+"""
+import sys
+import time
+
+import recommendations
+from recommendations import RESOURCES, SECTIONS
+
+PEOPLE = (1, 4)
+
+
+class Recorder:
+    """Stands in for ``st``: records ``(method, text)`` per subheader."""
+
+    def __init__(self):
+        self.sections = {}
+        self._current = None
+
+    def subheader(self, title):
+        self._current = self.sections.setdefault(title, [])
+
+    def __getattr__(self, kind):
+        return lambda text: self._current.append((kind, text))
+
+
+def legacy(st, detected_situation, location, resources, people):
+    # Resource-based recommendations
+    st.subheader("⚠️ Immediate Actions")
+    if "Phone" in resources:
+        st.write("✓ Call 112 for help")
+        if detected_situation == "fire":
+            st.write("✓ Call Fire Department: 101")
+        elif detected_situation == "accident":
+            st.write("✓ Call Ambulance: 108")
+    else:
+        st.error("❌ Find communication method urgently")
+
+    if "Water" in resources and detected_situation != "flood":
+        st.write("✓ Stay hydrated")
+    elif detected_situation == "flood":
+        st.warning("⚠️ Avoid flood water - contaminated")
+
+    # Location + situation specific advice
+    st.subheader("💡 Situation-Specific Solutions")
+    if location == "Home":
+        if detected_situation == "fire":
+            st.write("🏠 Exit home immediately")
+            st.write("🚪 Use nearest safe exit")
+        elif detected_situation == "flood":
+            st.write("🏠 Move to highest floor")
+            st.write("⬆️ Avoid basement/ground floor")
+        else:
+            st.write("🏠 Stay indoors if safe")
+
+    elif location == "Outdoors":
+        if detected_situation == "earthquake":
+            st.write("🌲 Stay in open area")
+            st.write("🏢 Away from buildings")
+        else:
+            st.write("🌲 Find shelter immediately")
+
+    # Priority actions based on video analysis
+    st.subheader("📋 Priority Actions")
+    if detected_situation == "fire":
+        st.write("1. 🏃 Exit building NOW")
+        st.write("2. 📞 Call 101 (Fire)")
+        st.write("3. 🚫 Don't use elevators")
+        st.write(f"4. Account for {people} people")
+    elif detected_situation == "flood":
+        st.write("1. ⬆️ Move to higher ground")
+        st.write("2. 📞 Call 112 for rescue")
+        st.write("3. 🚫 Avoid walking in water")
+        st.write(f"4. Keep {people} people together")
+    else:
+        st.write("1. Ensure immediate safety")
+        st.write("2. Call for help (112)")
+        st.write("3. Secure shelter")
+        st.write(f"4. Plan for {people} people")
+
+
+def rendered(plan, people):
+    """A rule-table plan as the sidebar renders it, keyed like ``Recorder``."""
+    return {
+        title: [(kind, text.format(people=people)) for kind, text in plan[section]]
+        for section, title in SECTIONS
+    }
+
+
+def compare():
+    """Render every combination both ways.
+
+    Returns ``(combinations, mismatches, legacy_s, table_s)``; ``mismatches``
+    lists ``(situation, location, resources, people, legacy, table)``.
+    """
+    combinations = 0
+    mismatches = []
+    legacy_s = table_s = 0.0
+    for (situation, location, mask), plan in recommendations.all_plans():
+        resources = [name for i, name in enumerate(RESOURCES) if mask >> i & 1]
+        for people in PEOPLE:
+            start = time.perf_counter()
+            recorder = Recorder()
+            legacy(recorder, situation, location, resources, people)
+            legacy_s += time.perf_counter() - start
+            start = time.perf_counter()
+            table = rendered(recommendations.recommend(situation, location, resources), people)
+            table_s += time.perf_counter() - start
+            combinations += 1
+            if table != recorder.sections or table != rendered(plan, people):
+                mismatches.append((situation, location, resources, people, recorder.sections, table))
+    return combinations, mismatches, legacy_s, table_s
+
+
+def main():
+    combinations, mismatches, legacy_s, table_s = compare()
+    for situation, location, resources, people, old, new in mismatches[:5]:
+        print(f"MISMATCH {situation}/{location}/{resources}/{people}:\n"
+              f"  legacy {old}\n  table  {new}")
+    print(f"{combinations} combinations, {len(mismatches)} mismatches")
+    print(f"per plan: legacy branches {legacy_s / combinations * 1e6:.1f} us, "
+          f"rule table {table_s / combinations * 1e6:.1f} us")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
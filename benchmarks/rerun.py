@@ -0,0 +1,87 @@
+"""Script rerun time and delta payload size of the Streamlit app.
+
+Drives the app headlessly with Streamlit's AppTest, switching the language,
+disaster and first-aid selectboxes, and reports the median rerun time, the
+number of elements (one delta message each) and their total protobuf size.
+``--rev`` measures the script as it was at another git revision instead,
+for a before/after comparison:
+
+    python -m benchmarks.rerun
+    python -m benchmarks.rerun --rev HEAD~1
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "app_fixed.py")
+
+INTERACTIONS = [
+    ("select your language :", "english"),
+    ("select type of disaster :", "floods"),
+    ("select type of disaster :", "volcano"),
+    ("select your language :", "hindi"),
+    ("select type of disaster :", "बाढ़"),
+    ("Emergency type:", "Burns"),
+    ("Emergency type:", "Heart Attack"),
+]
+
+
+def walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from walk(child)
+
+
+def payload(at):
+    """``(elements, bytes)`` of everything the last run sent to the browser."""
+    protos = [node.proto for node in walk(at._tree) if getattr(node, "proto", None) is not None]
+    return len(protos), sum(proto.ByteSize() for proto in protos)
+
+
+def selectbox(at, label):
+    return next(box for box in at.selectbox if box.label == label)
+
+
+def measure(script, rounds):
+    at = AppTest.from_file(script, default_timeout=30)
+    at.run()
+    times = []
+    for _ in range(rounds):
+        for label, value in INTERACTIONS:
+            start = time.perf_counter()
+            selectbox(at, label).select(value).run()
+            times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, payload(at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rev", help="git revision of app_fixed.py to measure")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    script = SCRIPT
+    if args.rev:
+        source = subprocess.run(
+            ["git", "show", f"{args.rev}:app_fixed.py"], cwd=ROOT, check=True, capture_output=True
+        ).stdout
+        # Next to the real script so its local imports still resolve
+        fd, script = tempfile.mkstemp(prefix=".bench_app_", suffix=".py", dir=ROOT)
+        with os.fdopen(fd, "wb") as f:
+            f.write(source)
+    try:
+        rerun_ms, (elements, size) = measure(script, args.rounds)
+    finally:
+        if script != SCRIPT:
+            os.unlink(script)
+    print(f"{args.rev or 'working tree'}: rerun {rerun_ms:.1f} ms median, {elements} elements, {size} bytes")
+
+
+if __name__ == "__main__":
+    main()
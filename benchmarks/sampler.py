@@ -0,0 +1,46 @@
+"""Time per analysis for each frame-sampling strategy.
+
+    python -m benchmarks.sampler [--repeat 3]
+"""
+import argparse
+import time
+
+import cv2
+
+from benchmarks.synthetic import cached_clip
+from frame_sampler import SAMPLE_COUNT, STRATEGIES, sample_frames
+
+CLIPS = {
+    # name: (frames at 30 fps, fourcc, file name)
+    "short mp4v (10 s)": (300, "mp4v", "short_mp4v.mp4"),
+    "long mp4v (5 min)": (9000, "mp4v", "long_mp4v.mp4"),
+    "short MJPG (10 s)": (300, "MJPG", "short_mjpg.avi"),
+    "long MJPG (5 min)": (9000, "MJPG", "long_mjpg.avi"),
+}
+
+
+def time_analysis(path, strategy):
+    start = time.perf_counter()
+    cap = cv2.VideoCapture(path)
+    frames = sum(1 for _ in sample_frames(cap, SAMPLE_COUNT, strategy=strategy, path=path))
+    cap.release()
+    return time.perf_counter() - start, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'clip':<22}" + "".join(f"{s:>14}" for s in STRATEGIES))
+    for label, (frames, fourcc, name) in CLIPS.items():
+        path = cached_clip(name, frames, fourcc=fourcc)
+        row = f"{label:<22}"
+        for strategy in STRATEGIES:
+            best = min(time_analysis(path, strategy)[0] for _ in range(args.repeat))
+            row += f"{best * 1000:>11.1f} ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cold-start cost: heavy imports, first script run and first analysis.
+
+Every measurement runs in a fresh interpreter so nothing is already
+imported. "first analysis" is the Analyze click right after a deploy:
+without warm-up it pays for the OpenCV/NumPy imports itself; with warm-up
+they happened in the background while the page was being read (``--think``
+seconds).
+
+    python -m benchmarks.startup [--think 2]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.synthetic import cached_clip
+
+IMPORTS = """
+import json, time
+start = time.perf_counter()
+import numpy
+numpy_ms = (time.perf_counter() - start) * 1000
+import cv2
+cv2.VideoCapture().release()
+print(json.dumps({"numpy_ms": numpy_ms, "numpy_cv2_ms": (time.perf_counter() - start) * 1000}))
+"""
+
+FIRST_RUN = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+AppTest.from_file("app.py", default_timeout=60).run()
+print(json.dumps({"first_run_ms": (time.perf_counter() - start) * 1000}))
+"""
+
+FIRST_ANALYSIS = """
+import io, json, sys, time
+warm = sys.argv[1] == "warm"
+if warm:
+    import warmup
+    warmup.start()
+    time.sleep(float(sys.argv[3]))
+with open(sys.argv[2], "rb") as f:
+    upload = io.BytesIO(f.read())
+start = time.perf_counter()
+from video_analysis import analyze_upload
+analyze_upload(upload, name="clip.mp4")
+print(json.dumps({"first_analysis_ms": (time.perf_counter() - start) * 1000}))
+"""
+
+
+def run(code, *args):
+    out = subprocess.run(
+        [sys.executable, "-c", code, *args], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--think", type=float, default=2.0, help="seconds between page load and Analyze")
+    args = parser.parse_args()
+
+    clip = cached_clip("short_mp4v.mp4", 300, fourcc="mp4v")
+    imports = run(IMPORTS)
+    print(f"import numpy               {imports['numpy_ms']:8.0f} ms")
+    print(f"import numpy + cv2         {imports['numpy_cv2_ms']:8.0f} ms")
+    try:
+        print(f"first script run (app.py)  {run(FIRST_RUN)['first_run_ms']:8.0f} ms")
+    except subprocess.CalledProcessError as e:
+        print(f"first script run (app.py)  skipped: {e.stderr.strip().splitlines()[-1]}")
+    cold = run(FIRST_ANALYSIS, "cold", clip, "0")["first_analysis_ms"]
+    warm = run(FIRST_ANALYSIS, "warm", clip, str(args.think))["first_analysis_ms"]
+    print(f"first analysis, cold       {cold:8.0f} ms")
+    print(f"first analysis, warmed     {warm:8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Benchmark suite for the detection pipeline on a synthetic video corpus.
+
+Generates (once, under ``$BENCH_CLIP_DIR``) clips of water, muddy water,
+flames, darkness, a shaking camera, occasional jolts and a calm scene at
+several resolutions and lengths. Runs them through ``analyze_file`` and
+reports decode time, feature time, peak memory and the confusion matrix
+over the situations. Results are written as JSON so runs on different
+commits can be compared:
+
+    python -m benchmarks.suite -o bench.json
+    git checkout other-branch && python -m benchmarks.suite --baseline bench.json
+"""
+import argparse
+import collections
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import EXPECTED, LENGTHS, RESOLUTIONS, corpus
+from video_analysis import (
+    DEFAULT_FEATURES,
+    DEFAULT_MOTION,
+    DEFAULT_REGIONS,
+    ENGINES,
+    FEATURE_MODES,
+    MOTION_MODES,
+    REGION_MODES,
+    analyze_file,
+)
+
+SITUATIONS = ("flood", "fire", "earthquake", "power_outage", "accident", "general")
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_clip(path, engine, motion=None, regions=None, features=None):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = analyze_file(path, engine=engine, motion=motion, regions=regions, features=features)
+    wall_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, wall_ms, peak
+
+
+def summarize(records):
+    def mean(key):
+        return statistics.mean(r[key] for r in records)
+
+    return {
+        "clips": len(records),
+        "accuracy": sum(r["situation"] == r["expected"] for r in records) / len(records),
+        "wall_ms": mean("wall_ms"),
+        "decode_ms": mean("decode_ms"),
+        "features_ms": mean("features_ms"),
+        "frames_decoded": mean("frames_decoded"),
+        "peak_heap_mb": max(r["peak_heap_mb"] for r in records),
+    }
+
+
+def confusion(records):
+    matrix = {expected: collections.Counter() for expected in SITUATIONS}
+    for r in records:
+        matrix[r["expected"]][r["situation"]] += 1
+    return {expected: {s: row[s] for s in SITUATIONS} for expected, row in matrix.items()}
+
+
+def print_confusion(engine, matrix):
+    print(f"\n{engine}: rows = expected, columns = detected")
+    print(f"{'':<14}" + "".join(f"{s[:12]:>13}" for s in SITUATIONS))
+    for expected, row in matrix.items():
+        if any(row.values()):
+            print(f"{expected:<14}" + "".join(f"{row[s]:>13}" for s in SITUATIONS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", choices=ENGINES, action="append", help="engines to run (default: all)")
+    parser.add_argument("--motion", choices=MOTION_MODES, help="motion analysis (default: $ANALYSIS_MOTION or diff)")
+    parser.add_argument("--regions", choices=REGION_MODES, help="region mode (default: $ANALYSIS_REGIONS or frame)")
+    parser.add_argument("--features", choices=FEATURE_MODES, help="feature mode (default: $ANALYSIS_FEATURES or full)")
+    parser.add_argument("--resolution", choices=RESOLUTIONS, action="append", help="default: all")
+    parser.add_argument("--length", choices=LENGTHS, action="append", help="default: all")
+    parser.add_argument("-o", "--output", default="bench_output.json", help="results file (JSON)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    engines = args.engine or ENGINES
+    resolutions = {k: v for k, v in RESOLUTIONS.items() if not args.resolution or k in args.resolution}
+    lengths = {k: v for k, v in LENGTHS.items() if not args.length or k in args.length}
+
+    records = []
+    for path, scene, expected, res_name, length_name in corpus(resolutions, lengths, EXPECTED):
+        for engine in engines:
+            result, wall_ms, peak = run_clip(path, engine, args.motion, args.regions, args.features)
+            records.append({
+                "clip": f"{scene}_{res_name}_{length_name}",
+                "engine": engine,
+                "expected": expected,
+                "situation": result["situation"],
+                "counters": result["counters"],
+                "frames_decoded": result["frames_decoded"],
+                "wall_ms": wall_ms,
+                "decode_ms": result["timings"]["decode_ms"],
+                "features_ms": result["timings"]["features_ms"],
+                "peak_heap_mb": peak / 2**20,
+            })
+
+    by_engine = {e: [r for r in records if r["engine"] == e] for e in engines}
+    report = {
+        "revision": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "motion": args.motion or DEFAULT_MOTION,
+        "regions": args.regions or DEFAULT_REGIONS,
+        "features": args.features or DEFAULT_FEATURES,
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "summary": {e: summarize(rs) for e, rs in by_engine.items()},
+        "confusion": {e: confusion(rs) for e, rs in by_engine.items()},
+        "records": records,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["summary"]
+
+    print(f"{'engine':<10}{'accuracy':>10}{'wall ms':>10}{'decode ms':>11}{'feature ms':>12}{'decoded':>9}{'heap MB':>9}")
+    for engine, summary in report["summary"].items():
+        print(f"{engine:<10}{summary['accuracy']:>10.0%}{summary['wall_ms']:>10.1f}{summary['decode_ms']:>11.1f}"
+              f"{summary['features_ms']:>12.2f}{summary['frames_decoded']:>9.1f}{summary['peak_heap_mb']:>9.1f}")
+        if engine in baseline:
+            before = baseline[engine]
+            print(f"{'  vs base':<10}{summary['accuracy'] - before['accuracy']:>+10.0%}"
+                  f"{summary['wall_ms'] - before['wall_ms']:>+10.1f}{summary['decode_ms'] - before['decode_ms']:>+11.1f}"
+                  f"{summary['features_ms'] - before['features_ms']:>+12.2f}"
+                  f"{summary['frames_decoded'] - before['frames_decoded']:>+9.1f}"
+                  f"{summary['peak_heap_mb'] - before['peak_heap_mb']:>+9.1f}")
+    for engine, matrix in report["confusion"].items():
+        print_confusion(engine, matrix)
+    print(f"\nwrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
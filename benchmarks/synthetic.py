@@ -0,0 +1,177 @@
+"""Synthetic clips written locally with OpenCV's VideoWriter."""
+import io
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+
+def _moving_gradient(i, n, width, height):
+    x = (np.arange(width, dtype=np.uint16) + 4 * i) % 256
+    y = np.arange(height, dtype=np.uint16)[:, None] % 256
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    frame[..., 0] = x
+    frame[..., 1] = y
+    frame[..., 2] = (x + y) // 2
+    return frame
+
+
+def _flat(bgr, ripple=8):
+    """A flat colour with a slow ripple, e.g. water or flames."""
+    def draw(i, n, width, height):
+        x = np.arange(width, dtype=np.float32)
+        wave = (ripple * np.sin(x / 23.0 + i / 3.0)).astype(np.int16)
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        for c, value in enumerate(bgr):
+            frame[..., c] = np.clip(value + wave, 0, 255).astype(np.uint8)
+        return frame
+    return draw
+
+
+def _checkerboard(width, height, offset, cell=40, level=170):
+    x = (np.arange(width) + offset) // cell
+    y = (np.arange(height) + offset // 2) // cell
+    board = (((x[None, :] + y[:, None]) % 2) * level).astype(np.uint8)
+    return np.repeat(board[:, :, None], 3, axis=2)
+
+
+def _shaking(i, n, width, height):
+    # A new random camera offset on every frame
+    offset = int(np.random.default_rng(i).integers(0, 80))
+    return _checkerboard(width, height, offset)
+
+
+def _bumps(i, n, width, height):
+    # Still scene that jolts five times over the clip
+    return _checkerboard(width, height, 37 * (i * 6 // max(n, 1)))
+
+
+def _textured(bgr, amplitude, checker=False, moving=False):
+    """A flat colour plus zero-mean, pixel-sized texture: random noise, or a
+    one-pixel checkerboard. ``moving`` draws new noise for every frame."""
+    def draw(i, n, width, height):
+        if checker:
+            parity = (np.arange(height)[:, None] + np.arange(width)[None, :]) % 2
+            texture = np.where(parity, amplitude, -amplitude).astype(np.int16)[..., None]
+        else:
+            rng = np.random.default_rng(i if moving else 0)
+            texture = rng.integers(-amplitude, amplitude + 1, (height, width, 1), dtype=np.int16)
+        return np.clip(np.asarray(bgr, dtype=np.int16) + texture, 0, 255).astype(np.uint8)
+    return draw
+
+
+def _with_region(background, region, top, left, bottom, right):
+    """``background`` with ``region`` drawn in a box (fractions of the frame)."""
+    def draw(i, n, width, height):
+        frame = background(i, n, width, height)
+        y0, y1, x0, x1 = int(top * height), int(bottom * height), int(left * width), int(right * width)
+        frame[y0:y1, x0:x1] = region(i, n, x1 - x0, y1 - y0)
+        return frame
+    return draw
+
+
+SCENES = {
+    "gradient": _moving_gradient,
+    "flood": _flat((180, 120, 60)),
+    "muddy_flood": _flat((110, 130, 90)),
+    "fire": _flat((30, 100, 220), ripple=20),
+    "dark": _flat((18, 20, 22), ripple=3),
+    "shaking": _shaking,
+    "bumps": _bumps,
+    "calm": _flat((60, 60, 60), ripple=2),
+    # Hazards confined to part of the view, diluted in whole-frame averages
+    "corner_fire": _with_region(_flat((60, 60, 60), ripple=2), _flat((30, 100, 220), ripple=20), 0, 0.7, 0.3, 1),
+    "low_flood": _with_region(_flat((45, 55, 100), ripple=2), _flat((180, 120, 60)), 2 / 3, 0, 1, 1),
+    # Averages right at a per-frame threshold, under fine texture that
+    # subsampling can alias: blue ratio 0.4, brightness 100 with blue ratio
+    # above 0.3, red ratio above 0.4 at brightness 70, brightness 45, motion 25
+    "edge_water": _textured((100, 60, 90), 40),
+    "edge_reflection": _textured((117, 93, 99), 30, checker=True),
+    "edge_fire": _textured((53, 68, 98), 40, checker=True),
+    "edge_dark": _textured((46, 45, 46), 20, checker=True),
+    "edge_dark_noise": _textured((47, 46, 47), 30),
+    "edge_motion": _textured((128, 128, 128), 38, moving=True),
+}
+
+# The situation each scene should be classified as
+EXPECTED = {
+    "flood": "flood",
+    "muddy_flood": "flood",
+    "fire": "fire",
+    "dark": "power_outage",
+    "shaking": "earthquake",
+    "bumps": "accident",
+    "calm": "general",
+}
+
+# Scenes only the tiled analysis (``ANALYSIS_REGIONS=tiles``) should catch
+LOCAL_EXPECTED = {
+    "corner_fire": "fire",
+    "low_flood": "flood",
+}
+
+
+# Scenes whose per-frame indicator sits at a threshold: no expected
+# situation, but any feature shortcut must decide every frame like the
+# full-resolution loop does
+BORDERLINE = {
+    "edge_water": "water",
+    "edge_reflection": "water",
+    "edge_fire": "fire",
+    "edge_dark": "dark",
+    "edge_dark_noise": "dark",
+    "edge_motion": "moving",
+}
+
+
+def write_clip(path, frames, size=(640, 360), fps=30, scene="gradient", fourcc="mp4v"):
+    """Write ``frames`` frames of ``scene`` to ``path`` and return the path."""
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"VideoWriter could not open {path} with {fourcc}")
+    draw = SCENES[scene]
+    try:
+        for i in range(frames):
+            writer.write(draw(i, frames, width, height))
+    finally:
+        writer.release()
+    return path
+
+
+def clip_dir():
+    """Directory for generated clips, reused between runs."""
+    path = os.environ.get("BENCH_CLIP_DIR") or os.path.join(tempfile.gettempdir(), "emergency-bench-clips")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cached_clip(name, frames, **kwargs):
+    """Return a clip from ``clip_dir()``, generating it on first use."""
+    path = os.path.join(clip_dir(), name)
+    if not os.path.exists(path):
+        write_clip(path, frames, **kwargs)
+    return path
+
+
+class Upload(io.BytesIO):
+    """A clip held in memory the way Streamlit hands over an ``UploadedFile``."""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+RESOLUTIONS = {"360p": (640, 360), "720p": (1280, 720), "1080p": (1920, 1080)}
+LENGTHS = {"5s": 150, "30s": 900}
+
+
+def corpus(resolutions=RESOLUTIONS, lengths=LENGTHS, scenes=EXPECTED):
+    """Yield ``(path, scene, expected situation, resolution, length)`` for a clip set."""
+    for res_name, size in resolutions.items():
+        for length_name, frames in lengths.items():
+            for scene in scenes:
+                path = cached_clip(f"{scene}_{res_name}_{length_name}.mp4", frames, size=size, scene=scene)
+                yield path, scene, EXPECTED[scene], res_name, length_name
@@ -0,0 +1,67 @@
+"""Whole-frame vs. tiled (8x8) hazard analysis.
+
+Classifies the reference scenes plus scenes with a hazard confined to part
+of the view (a fire in a corner, water in the bottom third) in both region
+modes, then compares the per-frame cost of the whole feature path of each
+mode on decoded frames at several resolutions: the original loop
+(full-frame ``np.mean``), the whole-frame features and the tiled analysis
+(thumbnails, tile statistics, heatmap and preview). Decoding is the same in
+every mode and is not included. Exits non-zero if the tiled mode
+misclassifies any scene.
+
+    python -m benchmarks.tiles
+"""
+import sys
+import time
+
+import cv2
+
+from benchmarks.features import legacy_counters
+from benchmarks.synthetic import EXPECTED, LOCAL_EXPECTED, cached_clip
+from frame_sampler import sample_frames
+from video_analysis import analyze_file, count_signals, count_signals_tiles
+
+FRAMES = 300
+COST_FRAMES = 90
+COST_SCENE = "corner_fire"
+RESOLUTIONS = {"360p": (640, 360), "1080p": (1920, 1080), "4k": (3840, 2160)}
+REPEAT = 5
+
+
+def per_frame_us(fn, frames):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(frames)
+    return (time.perf_counter() - start) / REPEAT / len(frames) * 1e6
+
+
+def decoded(path):
+    cap = cv2.VideoCapture(path)
+    frames = list(sample_frames(cap, path=path))
+    cap.release()
+    return frames
+
+
+def main():
+    misses = 0
+    print(f"{'clip':<14}{'expected':>14}{'frame':>14}{'tiles':>14}{'score':>7}")
+    for scene, expected in {**EXPECTED, **LOCAL_EXPECTED}.items():
+        path = cached_clip(f"{scene}_tiles.mp4", FRAMES, scene=scene)
+        whole = analyze_file(path, regions="frame", engine="loop")
+        tiled = analyze_file(path, regions="tiles")
+        misses += tiled["situation"] != expected
+        print(f"{scene:<14}{expected:>14}{whole['situation']:>14}{tiled['situation']:>14}"
+              f"{tiled['hazard_score']:>7.2f}")
+
+    print(f"\n{'per frame':<14}{'legacy us':>12}{'frame us':>12}{'tiles us':>12}")
+    for res_name, size in RESOLUTIONS.items():
+        frames = decoded(cached_clip(f"{COST_SCENE}_{res_name}.mp4", COST_FRAMES, size=size, scene=COST_SCENE))
+        legacy_us = per_frame_us(legacy_counters, frames)
+        frame_us = per_frame_us(count_signals, frames)
+        tiles_us = per_frame_us(count_signals_tiles, frames)
+        print(f"{res_name:<14}{legacy_us:>12.0f}{frame_us:>12.0f}{tiles_us:>12.0f}")
+    sys.exit(1 if misses else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Analysis throughput with thread vs. process workers.
+
+Submits a burst of simultaneous analyses (distinct uploads, so nothing is a
+cache hit) to an ``AnalysisQueue`` in each worker mode and reports analyses
+per second, plus how many were turned away by backpressure when the burst is
+larger than the queue.
+
+    python -m benchmarks.workers [--workers 4] [--jobs 16]
+"""
+import argparse
+import os
+import time
+
+from analysis_cache import AnalysisCache
+from analysis_errors import QueueFull
+from analysis_queue import MODES, AnalysisQueue
+from analysis_runner import start_analysis
+from benchmarks.synthetic import Upload, cached_clip
+
+FRAMES = 900
+
+
+def burst(queue, data, jobs):
+    cache = AnalysisCache()
+    start = time.perf_counter()
+    accepted, rejected = [], 0
+    for i in range(jobs):
+        # A trailing byte per job changes the content hash but not the video
+        upload = Upload(data + bytes([i % 256]) * (i // 256 + 1), f"burst_{i}.mp4")
+        try:
+            accepted.append(start_analysis(queue, cache, upload, upload.name))
+        except QueueFull:
+            rejected += 1
+    for job in accepted:
+        job.result()
+    return len(accepted), rejected, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--jobs", type=int, default=16, help="analyses submitted at once")
+    parser.add_argument("--queue-size", type=int, default=None, help="default: 2 x workers")
+    args = parser.parse_args()
+
+    with open(cached_clip("workers.mp4", FRAMES), "rb") as f:
+        data = f.read()
+    print(f"{'mode':<10}{'workers':>8}{'done':>6}{'rejected':>10}{'wall s':>8}{'per s':>8}")
+    for mode in MODES:
+        queue = AnalysisQueue(workers=args.workers, mode=mode, max_pending=args.queue_size)
+        queue.run(len, b"")  # spawn a worker process outside the timing
+        done, rejected, wall = burst(queue, data, args.jobs)
+        queue.shutdown()
+        print(f"{mode:<10}{args.workers:>8}{done:>6}{rejected:>10}{wall:>8.2f}{done / wall:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Classify a backlog of field videos outside the Streamlit app.
+
+Takes video files, directories (searched recursively) or manifests (a text
+file with one path per line, or JSONL with a ``path`` field), classifies
+them in parallel across a process pool and streams one JSON line per video
+as soon as it finishes. Videos that cannot be analysed are reported with an
+``error`` instead of being counted as a "general" emergency.
+
+    python classify_videos.py field_videos/ --workers 8 > results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from decode_backend import BACKENDS
+from frame_sampler import SAMPLE_COUNT, STRATEGIES
+from video_analysis import ENGINES, FEATURE_MODES, MOTION_MODES, REGION_MODES, analyze_file
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv"}
+MANIFEST_EXTENSIONS = {".txt", ".jsonl"}
+
+
+def read_manifest(path):
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)["path"] if line.startswith("{") else line
+            yield entry if os.path.isabs(entry) else os.path.join(base, entry)
+
+
+def find_videos(sources):
+    """Expand files, directories and manifests into a list of video paths."""
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS:
+                        yield os.path.join(root, name)
+        elif os.path.splitext(source)[1].lower() in MANIFEST_EXTENSIONS:
+            yield from read_manifest(source)
+        else:
+            yield source
+
+
+def classify_one(path, count, strategy, engine, motion=None, regions=None, backend=None, features=None):
+    """Worker entry point: never raises, failures become an ``error`` record."""
+    start = time.perf_counter()
+    try:
+        result = analyze_file(path, count, strategy, engine, motion, regions=regions, backend=backend,
+                              features=features)
+    except Exception as e:
+        return {"path": path, "error": str(e) or type(e).__name__, "error_type": type(e).__name__}
+    result["timings"]["total_ms"] = (time.perf_counter() - start) * 1000
+    return {"path": path, **result}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="+", help="video files, directories or manifests")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes (default: all cores)")
+    parser.add_argument("--samples", type=int, default=SAMPLE_COUNT, help="frames sampled per video")
+    parser.add_argument("--strategy", choices=STRATEGIES, default=None, help="frame sampling strategy")
+    parser.add_argument("--engine", choices=ENGINES, default=None, help="analysis engine (default: adaptive)")
+    parser.add_argument("--motion", choices=MOTION_MODES, default=None, help="motion analysis (default: diff)")
+    parser.add_argument("--regions", choices=REGION_MODES, default=None, help="whole frame or 8x8 tiles (default: frame)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None, help="video decoder (default: auto)")
+    parser.add_argument("--features", choices=FEATURE_MODES, default=None,
+                        help="full frame or thumbnail features (default: full)")
+    parser.add_argument("-o", "--output", help="write JSONL here instead of stdout")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failures = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            options = (args.samples, args.strategy, args.engine, args.motion, args.regions, args.backend, args.features)
+            futures = {executor.submit(classify_one, path, *options): path for path in find_videos(args.sources)}
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # The worker process itself died (e.g. a decoder segfault)
+                    record = {"path": futures[future], "error": str(e), "error_type": type(e).__name__}
+                failures += "error" in record
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{len(futures)} videos, {failures} failed", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""Choice of video decoder behind the ``cv2.VideoCapture`` interface.
+
+``"auto"`` is OpenCV's default (whatever backend it prefers, default
+threading). ``"ffmpeg"`` forces OpenCV's FFmpeg backend with an explicit
+decoder thread count and asks for hardware acceleration where the build has
+any (it falls back to software decoding silently). ``"pyav"`` decodes with
+PyAV (optional, ``pip install av``) through a small adapter exposing the
+part of the capture API ``frame_sampler`` uses. It reads the container's
+duration up front, so clips without a per-stream frame count or duration
+(e.g. WebM) still get an index plan, and reports the keyframe interval so
+the sampler can pick seek vs. sequential decoding from the real GOP instead
+of a typical one.
+
+    DECODE_BACKEND=ffmpeg DECODE_THREADS=4 streamlit run app.py
+"""
+import os
+
+import cv2
+
+from analysis_params import BACKENDS, DEFAULT_BACKEND
+from frame_sampler import fourcc_of
+
+# 0 lets the decoder pick (usually one thread per core)
+DEFAULT_THREADS = int(os.environ.get("DECODE_THREADS") or 0)
+# Packets demuxed (not decoded) to measure the keyframe interval
+PROBE_PACKETS = 600
+
+
+def ffmpeg_params(threads=None):
+    """``VideoCapture`` open parameters for the FFmpeg backend."""
+    threads = DEFAULT_THREADS if threads is None else threads
+    params = []
+    # Both properties are recent (4.5 / 4.8): older builds just skip them
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        params += [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+    if threads and hasattr(cv2, "CAP_PROP_N_THREADS"):
+        params += [cv2.CAP_PROP_N_THREADS, threads]
+    return params
+
+
+def open_capture(source, backend=None, threads=None):
+    """Open ``source`` (a path, or a binary file-like object) for decoding.
+
+    File-like objects need OpenCV 4.11+ unless the backend is ``"pyav"``;
+    returns ``None`` when the installed OpenCV cannot read from a stream.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown decode backend: {backend!r}")
+    if backend == "pyav":
+        return PyAVCapture(source, threads)
+    if isinstance(source, str):
+        if backend == "auto":
+            return cv2.VideoCapture(source)
+        return cv2.VideoCapture(source, cv2.CAP_FFMPEG, ffmpeg_params(threads))
+    try:
+        return cv2.VideoCapture(source, cv2.CAP_FFMPEG, ffmpeg_params(threads) if backend == "ffmpeg" else [])
+    except (TypeError, cv2.error):
+        # OpenCV < 4.11 has no stream (IStreamReader) overload
+        return None
+
+
+def stream_info(cap):
+    """Container metadata of an open capture, read before any decoding.
+
+    ``duration_s`` is the container's own duration where the backend reports
+    it, else derived from the frame count; ``keyframe_interval`` is ``None``
+    where the backend cannot tell.
+    """
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    duration = getattr(cap, "duration_s", None)
+    if duration is None and fps > 0 and frame_count > 0:
+        duration = frame_count / fps
+    return {
+        "frame_count": frame_count,
+        "fps": fps,
+        "duration_s": duration,
+        "codec": fourcc_of(cap).strip("\0"),
+        "keyframe_interval": getattr(cap, "keyframe_interval", None),
+    }
+
+
+class PyAVCapture:
+    """The subset of ``cv2.VideoCapture`` used by ``frame_sampler``, on PyAV."""
+
+    def __init__(self, source, threads=None):
+        try:
+            import av
+        except ImportError:
+            raise ImportError("the pyav decode backend needs PyAV: pip install av") from None
+
+        threads = DEFAULT_THREADS if threads is None else threads
+        self._container = self._stream = self._frames = self._grabbed = None
+        self._pending = None  # the frame a seek stopped on, not yet handed out
+        self._pos = 0
+        self.duration_s = self.keyframe_interval = None
+        try:
+            self._container = av.open(source)
+        except (av.error.FFmpegError, OSError):
+            return
+        if not self._container.streams.video:
+            return
+        self._stream = self._container.streams.video[0]
+        self._stream.thread_type = "AUTO"
+        if threads:
+            self._stream.codec_context.thread_count = threads
+        self.duration_s = _duration(av, self._container, self._stream)
+        if isinstance(source, str) or getattr(source, "seekable", lambda: False)():
+            self.keyframe_interval = _keyframe_interval(av, self._container, self._stream)
+        self._frames = self._container.decode(self._stream)
+
+    def isOpened(self):
+        return self._stream is not None
+
+    @property
+    def _fps(self):
+        return float(self._stream.average_rate or self._stream.guessed_rate or 0)
+
+    def _frame_count(self):
+        if self._stream.frames:
+            return self._stream.frames
+        return int(round((self.duration_s or 0) * self._fps))
+
+    def get(self, prop):
+        if self._stream is None:
+            return 0.0
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self._frame_count())
+        if prop == cv2.CAP_PROP_FPS:
+            return self._fps
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._pos)
+        if prop == cv2.CAP_PROP_FOURCC:
+            tag = (self._stream.codec_context.codec_tag or "").ljust(4, "\0")[:4]
+            return float(sum(ord(c) << (8 * i) for i, c in enumerate(tag)))
+        return 0.0
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self._seek(int(value))
+        if prop == cv2.CAP_PROP_POS_AVI_RATIO:
+            return self._seek(int(value * self._frame_count()))
+        return False
+
+    def _seek(self, index):
+        fps = self._fps
+        self._pending = None
+        if index <= 0 or fps <= 0:
+            self._container.seek(0, stream=self._stream)
+            self._frames = self._container.decode(self._stream)
+            self._pos = 0
+            return True
+        target = index / fps
+        start = (self._stream.start_time or 0) * self._stream.time_base
+        self._container.seek(int((start + target) / self._stream.time_base), stream=self._stream, backward=True)
+        self._frames = self._container.decode(self._stream)
+        # Decode forward from the keyframe up to the frame at ``index``
+        half_frame = 0.5 / fps
+        for frame in self._frames:
+            if frame.time is not None and frame.time - start >= target - half_frame:
+                self._pending = frame
+                self._pos = index
+                return True
+        return False
+
+    def grab(self):
+        if self._pending is not None:
+            self._grabbed, self._pending = self._pending, None
+        else:
+            self._grabbed = next(self._frames, None) if self._frames is not None else None
+        if self._grabbed is None:
+            return False
+        self._pos += 1
+        return True
+
+    def retrieve(self):
+        if self._grabbed is None:
+            return False, None
+        return True, self._grabbed.to_ndarray(format="bgr24")
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self):
+        if self._container is not None:
+            self._container.close()
+            self._container = None
+
+
+def _duration(av, container, stream):
+    """Seconds of video from the stream's header, else the container's."""
+    if stream.duration:
+        return float(stream.duration * stream.time_base)
+    if container.duration:
+        return container.duration / av.time_base
+    return None
+
+
+def _keyframe_interval(av, container, stream):
+    """Mean distance between keyframes over the first packets, or ``None``.
+
+    Demuxes (without decoding) from the start of the open container and
+    seeks back to it afterwards, so the source, a path or a seekable
+    stream, is only opened once.
+    """
+    keyframes = []
+    try:
+        for n, packet in enumerate(container.demux(stream)):
+            if n >= PROBE_PACKETS:
+                break
+            if packet.size and packet.is_keyframe:
+                keyframes.append(n)
+    except (av.error.FFmpegError, OSError):
+        keyframes = []
+    container.seek(0, stream=stream)
+    if len(keyframes) < 2:
+        return None
+    return (keyframes[-1] - keyframes[0]) / (len(keyframes) - 1)
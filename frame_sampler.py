@@ -0,0 +1,195 @@
+"""Frame sampling for the sidebar video analysis.
+
+Seeking with ``CAP_PROP_POS_FRAMES`` makes FFmpeg jump back to the previous
+keyframe and decode forward for every sample. On long-GOP phone video
+(H.264/HEVC) that is far slower than decoding straight through and only
+``grab()``-ing the frames in between, while intra-only codecs (MJPEG, ProRes)
+can seek almost for free. ``sample_frames`` picks between the two per clip.
+"""
+import os
+import time
+
+import cv2
+
+from analysis_params import DEFAULT_STRATEGY, SAMPLE_COUNT, STRATEGIES
+
+# Every frame is a keyframe, so a seek costs exactly one decode
+INTRA_ONLY_CODECS = {
+    "MJPG", "mjpg", "MJPA", "JPEG", "jpeg", "PNG ", "png ",
+    "apch", "apcn", "apcs", "apco", "ap4h", "AVdn", "FFV1", "HFYU",
+}
+
+# Containers OpenCV/FFmpeg cannot seek in cheaply (no index)
+UNINDEXED_CONTAINERS = {".ts", ".mts", ".m2ts", ".h264", ".264", ".hevc", ".webm"}
+
+# Beyond this many frames between samples a keyframe seek beats decoding
+# every skipped frame: a seek decodes from the previous keyframe, at most a
+# GOP, and typical phone GOPs are 30-60 frames (the same rule as for a
+# measured keyframe interval, with the longest typical GOP)
+SEQUENTIAL_MAX_INTERVAL = 60
+
+
+def fourcc_of(cap):
+    """Return the capture's codec as a four character string."""
+    code = int(cap.get(cv2.CAP_PROP_FOURCC))
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def sample_indices(total_frames, count=SAMPLE_COUNT, offset=0):
+    """Evenly spaced frame indices, matching the original sidebar loop.
+
+    ``offset`` shifts every index (e.g. by half an interval to sample the
+    frames in between a previous pass).
+    """
+    interval = max(1, total_frames // count)
+    return [i + offset for i in range(0, total_frames, interval) if i + offset < total_frames][:count]
+
+
+def has_unsampled_frames(cap, count=SAMPLE_COUNT):
+    """Whether an offset pass of ``count`` samples would see new frames."""
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    return total_frames <= 0 or total_frames // count >= 2
+
+
+def choose_strategy(cap, path=None, interval=1):
+    """Pick ``"seek"`` or ``"sequential"`` for this container and codec.
+
+    When the capture knows the clip's keyframe interval (see
+    ``decode_backend``) it replaces the typical-GOP guess: a seek decodes
+    from the previous keyframe, so it only pays off for samples more than a
+    GOP apart.
+    """
+    if fourcc_of(cap) in INTRA_ONLY_CODECS:
+        return "seek"
+    ext = os.path.splitext(path)[1].lower() if path else ""
+    if ext in UNINDEXED_CONTAINERS:
+        return "sequential"
+    gop = getattr(cap, "keyframe_interval", None)
+    if gop:
+        return "sequential" if interval <= gop else "seek"
+    return "sequential" if interval <= SEQUENTIAL_MAX_INTERVAL else "seek"
+
+
+def _decoded(stats):
+    if stats is not None:
+        stats["frames_decoded"] = stats.get("frames_decoded", 0) + 1
+
+
+def _read_following(cap, stats):
+    ret, frame = cap.read()
+    if not ret:
+        return None
+    _decoded(stats)
+    return frame
+
+
+def _seek_frames(cap, indices, stats, pairs):
+    for i in indices:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, i)
+        ret, frame = cap.read()
+        if not ret:
+            return
+        _decoded(stats)
+        yield (frame, _read_following(cap, stats)) if pairs else frame
+
+
+def _sequential_frames(cap, indices, stats, pairs):
+    if cap.get(cv2.CAP_PROP_POS_FRAMES) > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    pos = 0
+    following = None
+    for target in indices:
+        if following is not None and target == pos - 1:
+            # The previous sample's partner is this sample (interval of 1)
+            frame = following
+        else:
+            while pos < target:
+                # grab() decodes without the BGR conversion of retrieve()
+                if not cap.grab():
+                    return
+                _decoded(stats)
+                pos += 1
+            ret, frame = cap.read()
+            if not ret:
+                return
+            _decoded(stats)
+            pos += 1
+        if not pairs:
+            yield frame
+            continue
+        # Retrieving the next frame costs no extra decode: the skip loop
+        # above would grab() it anyway
+        following = _read_following(cap, stats)
+        if following is not None:
+            pos += 1
+        yield frame, following
+
+
+def _ratio_frames(cap, ratios, stats, pairs):
+    """Seek by position in the clip's duration rather than by frame index."""
+    for ratio in ratios:
+        cap.set(cv2.CAP_PROP_POS_AVI_RATIO, ratio)
+        ret, frame = cap.read()
+        if not ret:
+            return
+        _decoded(stats)
+        yield (frame, _read_following(cap, stats)) if pairs else frame
+
+
+def _with_duration_fallback(frames, cap, indices, total_frames, stats, pairs):
+    # VFR phone video often reports a wrong CAP_PROP_FRAME_COUNT: when the
+    # frames run out early, take the remaining samples by duration instead
+    yielded = 0
+    for frame in frames:
+        yielded += 1
+        yield frame
+    if 0 < yielded < len(indices):
+        yield from _ratio_frames(cap, [i / total_frames for i in indices[yielded:]], stats, pairs)
+
+
+def _timed(frames, stats):
+    """Accumulate the time spent producing each frame in ``stats["decode_ms"]``."""
+    frames = iter(frames)
+    while True:
+        start = time.perf_counter()
+        frame = next(frames, None)
+        stats["decode_ms"] = stats.get("decode_ms", 0.0) + (time.perf_counter() - start) * 1000
+        if frame is None:
+            return
+        yield frame
+
+
+def sample_frames(cap, count=SAMPLE_COUNT, strategy=None, path=None, offset=0.0, stats=None, pairs=False):
+    """Yield up to ``count`` evenly spaced BGR frames from ``cap``.
+
+    ``strategy`` is one of ``STRATEGIES``; ``"auto"`` (the default, or
+    ``$FRAME_SAMPLER_STRATEGY``) decides from the codec, the container
+    extension of ``path`` and the sample spacing. ``offset`` shifts the
+    samples by that fraction of the sample interval. If the container does
+    not report a usable frame count the samples are taken by duration. When
+    a ``stats`` dict is given, ``stats["frames_decoded"]`` counts every frame
+    the decoder produced, including skipped ones, and ``stats["decode_ms"]``
+    the time spent seeking and decoding. With ``pairs=True`` each item is
+    ``(frame, following)``: the sample and the frame right after it (or
+    ``None`` at the end of the clip), for short-interval motion analysis.
+    """
+    strategy = strategy or DEFAULT_STRATEGY
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy: {strategy!r}")
+
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if total_frames <= 0:
+        frames = _ratio_frames(cap, [(j + offset) / count for j in range(count)], stats, pairs)
+        return frames if stats is None else _timed(frames, stats)
+
+    interval = max(1, total_frames // count)
+    indices = sample_indices(total_frames, count, int(offset * interval))
+    if strategy == "auto":
+        strategy = choose_strategy(cap, path, interval)
+
+    if strategy == "seek":
+        frames = _seek_frames(cap, indices, stats, pairs)
+    else:
+        frames = _sequential_frames(cap, indices, stats, pairs)
+    frames = _with_duration_fallback(frames, cap, indices, total_frames, stats, pairs)
+    return frames if stats is None else _timed(frames, stats)
@@ -0,0 +1,201 @@
+"""Precompiled, offline guidance bundle (SQLite).
+
+A build step compiles the guidance text (``guidance_content``), every
+situation x location x resources plan (``recommendations``) and, optionally,
+a local copy of the intro video into one versioned SQLite file. Identical
+plans are stored once. The app opens the bundle read-only with SQLite's
+memory mapping, so startup reads pages straight from the page cache and
+nothing on the page needs the network or the source modules (the resource
+names and section titles are stored with the plans). Without a bundle
+(e.g. in development) the same interface is served from the source modules.
+Whether a bundle matches the sources is checked at build time
+(``--check``), not when the app opens it.
+
+    python guidance_bundle.py                        # writes guidance.sqlite
+    python guidance_bundle.py --video intro.mp4      # with a local intro video
+    python guidance_bundle.py --check                # exit 1 if out of date
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+# Bump when the schema changes; older bundles are then ignored
+BUNDLE_VERSION = 2
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.environ.get("GUIDANCE_BUNDLE") or os.path.join(ROOT, "guidance.sqlite")
+DEFAULT_VIDEO = os.path.join(ROOT, "assets", "intro.mp4")
+MMAP_SIZE = 64 << 20
+
+logger = logging.getLogger("emergency.guidance")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE content (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE plan (id INTEGER PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE plan_index (
+    situation TEXT, location TEXT, mask INTEGER, plan_id INTEGER NOT NULL,
+    PRIMARY KEY (situation, location, mask)
+) WITHOUT ROWID;
+CREATE TABLE media (name TEXT PRIMARY KEY, mime TEXT NOT NULL, data BLOB NOT NULL) WITHOUT ROWID;
+"""
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def source_digest():
+    """SHA-256 of the guidance and plans the bundle is built from."""
+    import guidance_content
+    import recommendations
+
+    digest = hashlib.sha256(_dumps(guidance_content.load()).encode())
+    for key, plan in recommendations.all_plans():
+        digest.update(_dumps([key, plan]).encode())
+    return digest.hexdigest()
+
+
+def build(path=DEFAULT_PATH, video=None):
+    """Compile the bundle to ``path`` (atomically replacing it)."""
+    import guidance_content
+    import recommendations
+
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", str(BUNDLE_VERSION)),
+            ("digest", source_digest()),
+            ("built", time.strftime("%Y-%m-%dT%H:%M:%S%z")),
+            ("resources", _dumps(recommendations.RESOURCES)),
+            ("sections", _dumps(recommendations.SECTIONS)),
+        ])
+        conn.executemany(
+            "INSERT INTO content VALUES (?, ?)", ((k, _dumps(v)) for k, v in guidance_content.load().items())
+        )
+        plan_ids = {}
+        for (situation, location, mask), plan in recommendations.all_plans():
+            value = _dumps(plan)
+            if value not in plan_ids:
+                plan_ids[value] = len(plan_ids) + 1
+                conn.execute("INSERT INTO plan VALUES (?, ?)", (plan_ids[value], value))
+            conn.execute("INSERT INTO plan_index VALUES (?, ?, ?, ?)", (situation, location, mask, plan_ids[value]))
+        if video:
+            with open(video, "rb") as f:
+                conn.execute("INSERT INTO media VALUES ('intro', 'video/mp4', ?)", (f.read(),))
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+class GuidanceBundle:
+    """Read-only, memory-mapped view of a built bundle."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self.meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if int(self.meta.get("version", 0)) != BUNDLE_VERSION:
+            self._conn.close()
+            raise ValueError(f"bundle version {self.meta.get('version')} != {BUNDLE_VERSION}")
+        self._resource_bits = {name: 1 << i for i, name in enumerate(json.loads(self.meta["resources"]))}
+        self.sections = tuple(tuple(section) for section in json.loads(self.meta["sections"]))
+        # The text is needed on every page, so it is decoded once
+        self.content = {key: json.loads(value) for key, value in self._conn.execute("SELECT key, value FROM content")}
+
+    def recommend(self, situation, location, resources):
+        """Same as ``recommendations.recommend``, from the bundle."""
+        mask = 0
+        for name in resources:
+            mask |= self._resource_bits.get(name, 0)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT plan.value FROM plan_index JOIN plan ON plan.id = plan_index.plan_id"
+                " WHERE situation = ? AND location = ? AND mask = ?",
+                (situation, location, mask),
+            ).fetchone()
+        return json.loads(row[0])
+
+    def video(self, name):
+        """Bytes of a bundled video, or ``None``."""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM media WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+
+class SourceGuidance:
+    """The bundle interface served straight from the source modules."""
+
+    meta = {"version": "source"}
+
+    def __init__(self):
+        import guidance_content
+        import recommendations
+
+        self.content = guidance_content.load()
+        self.sections = recommendations.SECTIONS
+        self._recommend = recommendations.recommend
+
+    def recommend(self, situation, location, resources):
+        return self._recommend(situation, location, resources)
+
+    def video(self, name):
+        if name == "intro" and os.path.exists(DEFAULT_VIDEO):
+            with open(DEFAULT_VIDEO, "rb") as f:
+                return f.read()
+        return None
+
+
+def load(path=DEFAULT_PATH):
+    """The bundle at ``path``, or the source modules if it is missing or unusable."""
+    if os.path.exists(path):
+        try:
+            return GuidanceBundle(path)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("Ignoring guidance bundle %s: %s", path, e)
+    return SourceGuidance()
+
+
+def is_current(path=DEFAULT_PATH):
+    """Whether the bundle at ``path`` opens and was built from the current sources."""
+    try:
+        bundle = GuidanceBundle(path)
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning("Cannot open guidance bundle %s: %s", path, e)
+        return False
+    return bundle.meta.get("digest") == source_digest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH)
+    parser.add_argument("--video", help=f"local intro video to include (default: {DEFAULT_VIDEO} if present)")
+    parser.add_argument("--check", action="store_true", help="only check that the bundle is up to date")
+    args = parser.parse_args()
+
+    if args.check:
+        fresh = os.path.exists(args.output) and is_current(args.output)
+        print(f"{args.output}: {'up to date' if fresh else 'missing or out of date'}")
+        return 0 if fresh else 1
+    video = args.video or (DEFAULT_VIDEO if os.path.exists(DEFAULT_VIDEO) else None)
+    build(args.output, video)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""Static guidance shown in the app: disaster measures, first aid, contacts.
+
+The content is data keyed by language, disaster and section rather than
+dozens of ``st.write`` calls behind ``if/elif`` chains. ``load()`` builds the
+store once per process (the app keeps it in ``st.cache_resource``) and every
+section is a single markdown block, rendered with one ``st.markdown``.
+"""
+
+INTRO = """Disaster management is the process of preparing for, responding to, and recovering from natural or man-made disasters.
+
+It aims to reduce loss of life, property damage, and economic disruption.
+
+Key steps include preparedness, mitigation, response, and recovery.
+
+Awareness and training help communities react calmly and effectively during emergencies.
+
+Schools and institutions play a vital role in educating students about disaster safety protocols.
+
+Technology such as early warning systems, mobile apps, and virtual drills can strengthen preparedness.
+
+A strong disaster management system builds a resilient society that can face challenges with confidence."""
+
+# Played from the guidance bundle when a local copy was built in; otherwise
+# shown as a plain link (no embedded player), so a slow connection never
+# holds up the page
+INTRO_VIDEO_URL = "https://youtu.be/XLrp2czggB8"
+
+SAFETY_TIPS = """Few safety tips
+
+1. Stay calm and focused during emergencies.
+2. Be prepared for unexpected situations.
+3. Keep your home safe and secure.
+4. Listen to emergency alerts and follow instructions.
+5. Stay informed about local disaster management.
+6. Be aware of your surroundings and your surroundings.
+7. Stay connected with emergency services.
+8. Be prepared for potential hazards.
+9. Stay informed about the latest updates.
+10. Stay informed about the latest updates."""
+
+EMERGENCY_CONTACTS = """EMERGENCY CONTACTS
+
+1. Police: 100
+2. Fire Department: 101
+3. Ambulance: 108
+4. Disaster Management: 112
+5. National Disaster Response Center: 112
+6. Emergency Medical Services: 112
+7. National Emergency Operations Center: 112
+8. National Emergency Response System: 112
+9. National Emergency Operations Center: 112
+10. National Emergency Response System: 112"""
+
+# language -> disaster -> section -> markdown
+DISASTERS = {
+    "english": {
+        "volcano": {
+            "measures": """**Measures for volcanic eruptions**
+
+Before a Volcanic Eruption
+
+Stay informed: Listen to government warnings, geological updates, and emergency alerts.
+
+Prepare an emergency kit: Include water, food, torch, batteries, mask, first-aid kit, and important documents.
+
+Know evacuation routes: Identify safe shelters and practice evacuation drills.
+
+Protect your house: Seal windows/doors to prevent ash entry, and keep roofs strong (ash can be heavy).
+
+During a Volcanic Eruption
+
+Follow official instructions immediately—evacuate if told to.
+
+Stay indoors if evacuation is not possible; close all openings.
+
+Use masks or cloth to cover nose and mouth to avoid inhaling ash.
+
+
+Protect eyes with goggles; avoid wearing contact lenses.
+
+Stay away from rivers and streams (they may carry lava or mudflows).
+
+Do not drive unless necessary—ash reduces visibility and damages vehicles.
+
+After a Volcanic Eruption
+
+Wait for official “all clear” before returning home.
+
+Avoid ash-covered areas as much as possible.
+
+Clean roofs carefully—ash is heavy and can collapse structures.
+
+Wear protective gear while cleaning ash.
+
+Boil or filter water before drinking (ash can contaminate supplies).
+
+Help neighbors, especially children, elderly, and people with disabilities.""",
+        },
+        "floods": {
+            "measures": """**Measures for floods**
+
+Before a Flood
+
+Stay informed: Monitor weather reports and flood warnings.
+
+Prepare emergency kit: Water, food, flashlight, radio, first-aid supplies.
+
+Know evacuation routes: Identify higher ground and safe shelters.
+
+Secure your home: Move valuables to higher floors, turn off utilities if advised.
+
+During a Flood
+
+Evacuate immediately if told by authorities.
+
+Never walk or drive through flood water - "Turn Around, Don't Drown".
+
+Stay away from downed power lines.
+
+Seek higher ground immediately.
+
+After a Flood
+
+Wait for authorities to declare area safe.
+
+Avoid flood water - it may be contaminated.
+
+Document damage with photos for insurance.
+
+Clean and disinfect everything that got wet.""",
+        },
+        # Cross-language selections
+        "ज्वालामुखी": {"hint": "Please select 'volcano' for English"},
+        "बाढ़": {"hint": "Please select 'floods' for English"},
+        "None": {"hint": "Select a disaster type to see safety measures"},
+    },
+    "hindi": {
+        "ज्वालामुखी": {
+            "measures": """🌋 ज्वालामुखी विस्फोट से बचाव के उपाय
+🔹 विस्फोट से पहले (तैयारी)
+
+🏠 सुरक्षित निकासी मार्ग (evacuation plan) और शरण स्थल पहले से तय कर लो।
+
+📻 रेडियो/टीवी से सरकार द्वारा दी गई चेतावनियों पर ध्यान दो।
+
+📦 आपातकालीन किट तैयार रखो – टॉर्च, मास्क, पानी, भोजन, प्राथमिक उपचार।
+
+😷 धूल से बचने के लिए मास्क और चश्मा साथ रखो।
+
+🔹 विस्फोट के दौरान
+
+⛰️ ज्वालामुखी के पास बिल्कुल मत जाओ, तुरंत सुरक्षित स्थान पर चले जाओ।
+
+🏃‍♂️ सरकार या प्रशासन के निकासी आदेश का पालन करो।
+
+🪟 खिड़कियाँ और दरवाज़े बंद रखो ताकि राख (ash) अंदर न आ सके।
+
+😷 मास्क या गीले कपड़े से मुँह और नाक को ढककर सांस लो।
+
+🚗 गाड़ी चलाने से बचो, राख से सड़क फिसलन भरी और इंजन खराब हो सकता है।
+
+🔹 विस्फोट के बाद
+
+✅ प्रशासन द्वारा "सुरक्षित" घोषित किए जाने के बाद ही घर वापस जाओ।
+
+💧 राख को सावधानी से साफ करो (गीले कपड़े/पानी से), झाड़ू से सूखी सफाई मत करो।
+
+🚰 पीने का पानी छानकर या उबालकर इस्तेमाल करो, क्योंकि पानी दूषित हो सकता है।
+
+🧍 घायल और प्रभावित लोगों की मदद करो।""",
+        },
+        "बाढ़": {
+            "measures": """🌊 बाढ़ से बचाव के उपाय
+🔹 बाढ़ से पहले (तैयारी)
+
+🌧️ मौसम की जानकारी और बाढ़ की चेतावनी पर ध्यान दो।
+
+🎒 आपातकालीन किट तैयार रखो – पानी, खाना, टॉर्च, रेडियो।
+
+🏠 घर के महत्वपूर्ण सामान ऊंची जगह पर रखो।
+
+🔹 बाढ़ के दौरान
+
+🏃♂️ प्रशासन के निकासी आदेश का पालन करो।
+
+⚠️ बाढ़ के पानी में कभी मत चलो या गाड़ी मत चलाओ।
+
+⚡ टूटी बिजली की तारों से दूर रहो।
+
+🔹 बाढ़ के बाद
+
+✅ प्रशासन द्वारा सुरक्षित घोषित करने के बाद ही घर वापस जाओ।
+
+📷 नुकसान की तस्वीरें लो बीमा के लिए।
+
+🧽 सब कुछ साफ और कीटाणुरहित करो।""",
+        },
+        # Cross-language selections
+        "volcano": {"hint": "कृपया हिंदी में 'ज्वालामुखी' चुनें"},
+        "floods": {"hint": "कृपया हिंदी में 'बाढ़' चुनें"},
+        "None": {"hint": "आपदा की जानकारी देखने के लिए कोई आपदा चुनें"},
+    },
+}
+
+FIRST_AID = {
+    "Cuts": """🩹 For Cuts:
+
+1. Clean hands
+2. Stop bleeding
+3. Clean wound
+4. Apply bandage""",
+    "Burns": """🔥 For Burns:
+
+1. Cool with water (10-20 min)
+2. Remove jewelry
+3. Cover with clean cloth
+4. Seek medical help""",
+    "Choking": """🫁 For Choking:
+
+1. Encourage coughing
+2. Give 5 back blows
+3. Give 5 abdominal thrusts
+4. Call 108 if needed""",
+    "Heart Attack": """💔 For Heart Attack:
+
+1. Call 108 immediately
+2. Give aspirin if available
+3. Keep person calm and seated
+4. Monitor breathing and pulse""",
+}
+
+# Summary under "Analysis Results" for each detected situation
+SITUATIONS = {
+    "flood": """🌊 **Flood Emergency Detected**
+
+- Water hazard identified in video
+- Immediate evacuation recommended
+- Avoid electrical equipment and vehicles
+- Do not attempt to walk through flood water""",
+    "fire": """🔥 **Fire Emergency Detected**
+
+- Fire/smoke hazard identified
+- Exit building immediately via nearest safe route
+- Stay low to avoid smoke inhalation
+- Do not use elevators during fire""",
+    "power_outage": """⚡ **Power Outage/Dark Environment Detected**
+
+- Dark conditions detected in video
+- Use flashlight or phone light carefully
+- Stay in safe location until power restored
+- Conserve phone battery for emergencies""",
+    "earthquake": """🌍 **Earthquake Detected**
+
+- Seismic activity indicated
+- Take cover under sturdy furniture immediately
+- Stay away from windows and heavy objects
+- Do not run outside during active shaking""",
+    "accident": """🚑 **Accident Scene Detected**
+
+- Accident/injury situation identified
+- Call emergency services immediately
+- Provide first aid only if properly trained
+- Secure accident scene from further danger""",
+    "general": """🔍 **General Emergency**
+
+- Emergency situation detected
+- Assess immediate dangers in your environment
+- Follow general safety protocols""",
+}
+
+# "Video Analysis" tab
+VIDEO_ANALYSIS_TAB = {
+    "detection": """- 🌊 Flood detection
+- 🔥 Fire/smoke detection
+- 🌍 Earthquake detection
+- 🚑 Accident detection
+- 📍 Location analysis""",
+    "recommendations": """- ⚡ Real-time situation analysis
+- 📱 Emergency contact suggestions
+- 🎯 Situation-specific actions
+- 📋 Priority-based planning
+- 👥 Group safety management""",
+    "how_it_works": """1. Upload video showing your emergency situation
+2. AI analyzes video content for hazards
+3. Get situation-specific safety measures
+4. Receive priority actions based on your resources""",
+}
+
+
+def load():
+    """Return the whole guidance store as one nested dict."""
+    return {
+        "intro": INTRO,
+        "intro_video_url": INTRO_VIDEO_URL,
+        "safety_tips": SAFETY_TIPS,
+        "emergency_contacts": EMERGENCY_CONTACTS,
+        "disasters": DISASTERS,
+        "first_aid": FIRST_AID,
+        "situations": SITUATIONS,
+        "video_analysis_tab": VIDEO_ANALYSIS_TAB,
+    }
@@ -0,0 +1,106 @@
+"""Tiled hazard analysis: where in the frame water, fire and motion are.
+
+Whole-frame averages dilute a small fire in a corner or floodwater in the
+bottom third with the sky and walls around it. Here the area-averaged
+thumbnails of every sampled frame and of its difference to the previous one
+are split into an 8x8 grid and the usual indicators are evaluated per tile,
+for all frames in one vectorised pass. A frame counts as water
+or fire when enough of its tiles do, and the tiles are aggregated into a
+heatmap and a single hazard score for the clip.
+"""
+import base64
+
+import cv2
+import numpy as np
+
+from frame_features import DARK_BRIGHTNESS, batch_indicators
+
+GRID = (8, 8)  # (columns, rows); must divide the thumbnail size
+
+# Fraction of a frame's tiles that must show an indicator for the frame to
+# count: a fire can be small, floodwater has to cover a real part of the
+# ground. Water is only counted in the lower half of the view, where the
+# sky (which passes the muddy-water test) rarely is
+TILE_WATER_FRACTION = 0.4
+TILE_FIRE_FRACTION = 0.05
+TILE_MOTION_FRACTION = 0.1
+# Tiles (out of 64) averaged for the hazard score: the worst 1/8 of the view
+SCORE_TILES = 8
+# Weight of each indicator in a tile's hazard
+HAZARD_WEIGHTS = {"fire": 1.0, "water": 0.6, "moving": 0.4}
+
+
+def tile_features(thumbs, diffs, grid=GRID):
+    """Per-tile ``(avg_colors, brightness, motion)`` from ``(n, h, w, 3)``
+    frame thumbnails and ``(n - 1, h, w)`` thumbnails of the grey difference
+    between consecutive frames (``frame_features.thumbnail``).
+
+    Shapes are ``(n, rows, cols, 3)``, ``(n, rows, cols)`` and
+    ``(n - 1, rows, cols)``; tile means are exact means of the tile pixels.
+    """
+    n, height, width, _ = thumbs.shape
+    cols, rows = grid
+    tiles = thumbs.reshape(n, rows, height // rows, cols, width // cols, 3)
+    avg_colors = tiles.mean(axis=(2, 4))
+    brightness = avg_colors.mean(axis=-1)
+    motion = diffs.reshape(-1, rows, height // rows, cols, width // cols).mean(axis=(2, 4))
+    return avg_colors, brightness, motion
+
+
+def tile_indicators(avg_colors, brightness, motion):
+    """``batch_indicators`` per tile; each result is ``(n, rows, cols)`` bool.
+
+    The first frame has no motion (there is no previous frame).
+    """
+    n, rows, cols, _ = avg_colors.shape
+    motion = np.concatenate([np.zeros((1, rows, cols)), motion]) if n else motion
+    flags = batch_indicators(avg_colors.reshape(-1, 3), brightness.reshape(-1), motion.reshape(-1))
+    return tuple(flag.reshape(n, rows, cols) for flag in flags)
+
+
+def analyze_tiles(thumbs, diffs, grid=GRID):
+    """Frame flags plus heatmap for stacks of frame and difference thumbnails.
+
+    Returns ``(water, fire, dark, moving, heatmap, peak)``: boolean ``(n,)``
+    frame flags like ``batch_indicators``, the ``(rows, cols)`` heatmap of
+    how often each tile looked hazardous, and the index of the frame with
+    the most hazard.
+    """
+    avg_colors, brightness, motion = tile_features(thumbs, diffs, grid)
+    water, fire, _, moving = tile_indicators(avg_colors, brightness, motion)
+    # Darkness is a property of the whole view, not of a region
+    dark = brightness.mean(axis=(1, 2)) < DARK_BRIGHTNESS
+    hazard = np.maximum.reduce([
+        HAZARD_WEIGHTS["fire"] * fire, HAZARD_WEIGHTS["water"] * water, HAZARD_WEIGHTS["moving"] * moving,
+    ])
+    rows = water.shape[1]
+    return (
+        water[:, rows // 2:].mean(axis=(1, 2)) >= TILE_WATER_FRACTION,
+        fire.mean(axis=(1, 2)) >= TILE_FIRE_FRACTION,
+        dark,
+        moving.mean(axis=(1, 2)) >= TILE_MOTION_FRACTION,
+        hazard.mean(axis=0),
+        int(hazard.sum(axis=(1, 2)).argmax()),
+    )
+
+
+def hazard_score(heatmap):
+    """Mean of the ``SCORE_TILES`` hottest tiles, 0.0 to 1.0."""
+    return float(np.sort(heatmap, axis=None)[-SCORE_TILES:].mean())
+
+
+def encode_preview(thumb):
+    """A thumbnail as base64 JPEG, small enough to keep in a cached result."""
+    ok, jpeg = cv2.imencode(".jpg", thumb, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    return base64.b64encode(jpeg.tobytes()).decode("ascii") if ok else None
+
+
+def overlay(result, alpha=0.45):
+    """RGB image of the result's preview frame with its heatmap blended in."""
+    heatmap = np.asarray(result["heatmap"], dtype=np.float32)
+    preview = cv2.imdecode(np.frombuffer(base64.b64decode(result["preview_jpeg"]), np.uint8), cv2.IMREAD_COLOR)
+    height, width = preview.shape[:2]
+    heat = cv2.resize((heatmap * 255).astype(np.uint8), (width, height), interpolation=cv2.INTER_NEAREST)
+    colored = cv2.applyColorMap(heat, cv2.COLORMAP_JET)
+    blended = cv2.addWeighted(colored, alpha, preview, 1 - alpha, 0)
+    return cv2.cvtColor(blended, cv2.COLOR_BGR2RGB)
@@ -0,0 +1,98 @@
+"""Short-interval motion analysis: camera shake vs. moving objects.
+
+The original motion signal compares consecutive *samples*, which on long
+clips are seconds apart, so any scene change counts as motion. Here each
+sample is compared with the frame right after it (which the sequential
+sampler decodes anyway). Both are reduced to a small fixed grid, phase
+correlation measures the global (camera) shift, and what is left after
+undoing that shift is local motion (people, vehicles, debris). Shaking is a
+shift that keeps changing from pair to pair, not a steady pan. A jolt (the
+view jumps between samples and is still again at the next one) happens
+between pairs, so it is caught by comparing consecutive still samples. The
+cost per pair is fixed by the grid, so a clip costs at most one pair per
+sample.
+"""
+import math
+
+import cv2
+import numpy as np
+
+GRID = (128, 128)  # (width, height)
+
+# A grid pixel "changed" if it differs by more than LOCAL_DIFF; a pair with
+# no more than LOCAL_FRACTION of its pixels changed is still, whatever phase
+# correlation reports (on flat, dark or static views its peak is noise)
+LOCAL_DIFF = 25
+LOCAL_FRACTION = 0.03
+# Phase correlation peaks below this response are not a camera shift
+MIN_RESPONSE = 0.3
+# Change of the camera shift from one pair to the next (in grid pixels per
+# frame) that counts as shaking: 0.5 px on a 128 grid is ~0.4% of the frame
+# width. A steady pan keeps the same shift and does not count
+SHAKE_SHIFT = 0.5
+# A pair with no reliable shift shakes if this much of the view changed
+SHAKE_FRACTION = 0.3
+
+
+class MotionAnalyzer:
+    """Flag camera shake and local motion on the sample pairs of one clip.
+
+    Call it on the pairs in time order: shaking is measured against the
+    previous pair's camera shift, and a still pair that differs from the
+    previous still sample is a jolt (the view jumped between samples), which
+    counts as local motion. Use a new analyzer for every pass over a clip.
+    """
+
+    def __init__(self, grid=GRID):
+        self.grid = grid
+        self._window = cv2.createHanningWindow(grid, cv2.CV_32F)
+        self._shift = (0.0, 0.0)
+        self._still_sample = None
+
+    def _small(self, frame):
+        small = cv2.resize(frame, self.grid, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.float32)
+
+    def measure(self, a, b):
+        """Return ``(changed, shift, residual)`` for two grids.
+
+        ``changed`` is the fraction of changed pixels, ``shift`` the camera
+        shift ``(dx, dy)`` (``None`` if phase correlation finds no reliable
+        one) and ``residual`` the fraction still changed once it is undone.
+        """
+        changed = _changed_fraction(a, b)
+        if changed <= LOCAL_FRACTION:
+            return changed, (0.0, 0.0), changed
+        # phaseCorrelate applies the window to its inputs in place
+        (dx, dy), response = cv2.phaseCorrelate(a.copy(), b.copy(), self._window)
+        if response < MIN_RESPONSE:
+            return changed, None, changed
+        aligned = cv2.warpAffine(
+            b, np.float32([[1, 0, -dx], [0, 1, -dy]]), self.grid, borderMode=cv2.BORDER_REPLICATE
+        )
+        # Ignore the border strip the shift moved in from outside the frame
+        margin = min(int(math.ceil(max(abs(dx), abs(dy)))) + 1, min(self.grid) // 4)
+        inner = slice(margin, -margin)
+        return changed, (dx, dy), _changed_fraction(a[inner, inner], aligned[inner, inner])
+
+    def __call__(self, frame, following):
+        """Return ``(shaking, local_motion)`` flags for one sample pair."""
+        if following is None:
+            return False, False
+        a = self._small(frame)
+        changed, shift, residual = self.measure(a, self._small(following))
+        still = changed <= LOCAL_FRACTION
+        if shift is None:
+            shaking = changed > SHAKE_FRACTION
+        else:
+            shaking = math.hypot(shift[0] - self._shift[0], shift[1] - self._shift[1]) > SHAKE_SHIFT
+            self._shift = shift
+        jolt = still and self._still_sample is not None and (
+            _changed_fraction(self._still_sample, a) > LOCAL_FRACTION
+        )
+        self._still_sample = a if still else None
+        return shaking, residual > LOCAL_FRACTION or jolt
+
+
+def _changed_fraction(a, b):
+    return float(np.mean(np.abs(a - b) > LOCAL_DIFF))
@@ -0,0 +1,104 @@
+"""Situation x location x resources recommendations as a compiled rule table.
+
+Each rule says which section it belongs to, how it is displayed, and for
+which situations, locations and resources it applies. The rules are
+compiled once into a table indexed by ``(situation, location, resource
+bitmask)``, so a lookup is a single dict access and every combination can be
+enumerated (``all_plans``) and checked in bulk. Adding a disaster or a
+location means adding rows, not growing ``if/elif`` chains.
+"""
+import itertools
+
+RESOURCES = ("Water", "Food", "Flashlight", "First aid", "Phone", "Rope", "Blankets")
+RESOURCE_BITS = {name: 1 << i for i, name in enumerate(RESOURCES)}
+SITUATIONS = ("flood", "fire", "earthquake", "power_outage", "accident", "general")
+LOCATIONS = ("Home", "Office", "Outdoors", "Vehicle")
+
+# (section key, subheader)
+SECTIONS = (
+    ("immediate", "⚠️ Immediate Actions"),
+    ("solutions", "💡 Situation-Specific Solutions"),
+    ("priority", "📋 Priority Actions"),
+)
+
+ALL = frozenset(SITUATIONS)
+EVERYWHERE = frozenset(LOCATIONS)
+PHONE = RESOURCE_BITS["Phone"]
+WATER = RESOURCE_BITS["Water"]
+
+
+def _except(*situations):
+    return ALL - set(situations)
+
+
+# (section, st method, text, situations, locations, required resources,
+#  resources that must be absent); order within a section is display order.
+# ``{people}`` in a text is filled in when rendering.
+RULES = (
+    ("immediate", "write", "✓ Call 112 for help", ALL, EVERYWHERE, PHONE, 0),
+    ("immediate", "write", "✓ Call Fire Department: 101", {"fire"}, EVERYWHERE, PHONE, 0),
+    ("immediate", "write", "✓ Call Ambulance: 108", {"accident"}, EVERYWHERE, PHONE, 0),
+    ("immediate", "error", "❌ Find communication method urgently", ALL, EVERYWHERE, 0, PHONE),
+    ("immediate", "write", "✓ Stay hydrated", _except("flood"), EVERYWHERE, WATER, 0),
+    ("immediate", "warning", "⚠️ Avoid flood water - contaminated", {"flood"}, EVERYWHERE, 0, 0),
+
+    ("solutions", "write", "🏠 Exit home immediately", {"fire"}, {"Home"}, 0, 0),
+    ("solutions", "write", "🚪 Use nearest safe exit", {"fire"}, {"Home"}, 0, 0),
+    ("solutions", "write", "🏠 Move to highest floor", {"flood"}, {"Home"}, 0, 0),
+    ("solutions", "write", "⬆️ Avoid basement/ground floor", {"flood"}, {"Home"}, 0, 0),
+    ("solutions", "write", "🏠 Stay indoors if safe", _except("fire", "flood"), {"Home"}, 0, 0),
+    ("solutions", "write", "🌲 Stay in open area", {"earthquake"}, {"Outdoors"}, 0, 0),
+    ("solutions", "write", "🏢 Away from buildings", {"earthquake"}, {"Outdoors"}, 0, 0),
+    ("solutions", "write", "🌲 Find shelter immediately", _except("earthquake"), {"Outdoors"}, 0, 0),
+
+    ("priority", "write", "1. 🏃 Exit building NOW", {"fire"}, EVERYWHERE, 0, 0),
+    ("priority", "write", "2. 📞 Call 101 (Fire)", {"fire"}, EVERYWHERE, 0, 0),
+    ("priority", "write", "3. 🚫 Don't use elevators", {"fire"}, EVERYWHERE, 0, 0),
+    ("priority", "write", "4. Account for {people} people", {"fire"}, EVERYWHERE, 0, 0),
+    ("priority", "write", "1. ⬆️ Move to higher ground", {"flood"}, EVERYWHERE, 0, 0),
+    ("priority", "write", "2. 📞 Call 112 for rescue", {"flood"}, EVERYWHERE, 0, 0),
+    ("priority", "write", "3. 🚫 Avoid walking in water", {"flood"}, EVERYWHERE, 0, 0),
+    ("priority", "write", "4. Keep {people} people together", {"flood"}, EVERYWHERE, 0, 0),
+    ("priority", "write", "1. Ensure immediate safety", _except("fire", "flood"), EVERYWHERE, 0, 0),
+    ("priority", "write", "2. Call for help (112)", _except("fire", "flood"), EVERYWHERE, 0, 0),
+    ("priority", "write", "3. Secure shelter", _except("fire", "flood"), EVERYWHERE, 0, 0),
+    ("priority", "write", "4. Plan for {people} people", _except("fire", "flood"), EVERYWHERE, 0, 0),
+)
+
+
+def resource_mask(resources):
+    """Bitmask of the selected resource names (unknown names are ignored)."""
+    mask = 0
+    for name in resources:
+        mask |= RESOURCE_BITS.get(name, 0)
+    return mask
+
+
+def _compile(rules):
+    table = {}
+    for situation, location in itertools.product(SITUATIONS, LOCATIONS):
+        candidates = [
+            rule for rule in rules if situation in rule[3] and location in rule[4]
+        ]
+        for mask in range(1 << len(RESOURCES)):
+            plan = {section: [] for section, _ in SECTIONS}
+            for section, kind, text, _, _, required, absent in candidates:
+                if mask & required == required and not mask & absent:
+                    plan[section].append((kind, text))
+            table[situation, location, mask] = {
+                section: tuple(lines) for section, lines in plan.items()
+            }
+    return table
+
+
+TABLE = _compile(RULES)
+
+
+def recommend(situation, location, resources):
+    """Plan for a situation: ``{section: ((st method, text), ...)}``."""
+    return TABLE[situation, location, resource_mask(resources)]
+
+
+def all_plans():
+    """Yield ``((situation, location, mask), plan)`` for every combination."""
+    return iter(TABLE.items())
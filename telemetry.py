@@ -0,0 +1,138 @@
+"""Per-stage timings and counters for the video analysis path.
+
+Enabled with ``EMERGENCY_TELEMETRY=1``. Each analysis then logs one
+structured JSON line (logger ``emergency.telemetry``) and, if
+``EMERGENCY_METRICS_FILE`` is set, the running totals are rewritten to that
+file in the Prometheus text format after every analysis (point a
+node_exporter textfile collector at it). When disabled, ``stage()`` returns a
+shared no-op context manager and the other helpers return immediately.
+"""
+import collections
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+ENABLED = os.environ.get("EMERGENCY_TELEMETRY", "").lower() in ("1", "true", "yes", "on")
+METRICS_FILE = os.environ.get("EMERGENCY_METRICS_FILE")
+PREFIX = "emergency_analysis"
+
+logger = logging.getLogger("emergency.telemetry")
+
+_NULL_STAGE = contextlib.nullcontext()
+_lock = threading.Lock()
+_stage_seconds = collections.defaultdict(lambda: [0.0, 0])  # stage -> [sum, count]
+_counters = collections.Counter()
+_write_failed = False  # the last metrics file write failed (already logged)
+
+
+def observe(stage, ms):
+    """Record ``ms`` milliseconds spent in ``stage``."""
+    if not ENABLED:
+        return
+    with _lock:
+        totals = _stage_seconds[stage]
+        totals[0] += ms / 1000
+        totals[1] += 1
+
+
+def count(name, value=1):
+    """Add ``value`` to the counter ``name``."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] += value
+
+
+@contextlib.contextmanager
+def _timed_stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - start) * 1000)
+
+
+def stage(name):
+    """Context manager timing the enclosed block as ``name``."""
+    return _timed_stage(name) if ENABLED else _NULL_STAGE
+
+
+def record_analysis(result, **fields):
+    """Record the stage timings and frame counts of one analysis result.
+
+    Logs them together with ``fields`` (e.g. cache status, upload size) as a
+    single JSON line and refreshes the metrics file.
+    """
+    if not ENABLED:
+        return
+    timings = result.get("timings", {})
+    for name in ("open", "decode", "features"):
+        if f"{name}_ms" in timings:
+            observe(name, timings[f"{name}_ms"])
+    count("analyses_total")
+    count("frames_decoded_total", result.get("frames_decoded", 0))
+    count("frames_sampled_total", result["counters"]["frame_count"])
+    count(f"situation_{result['situation']}_total")
+    logger.info(json.dumps({
+        "event": "video_analysis",
+        "situation": result["situation"],
+        "frames_decoded": result.get("frames_decoded"),
+        "frames_sampled": result["counters"]["frame_count"],
+        "timings_ms": {k: round(v, 3) for k, v in timings.items()},
+        **fields,
+    }))
+    write_metrics()
+
+
+def prometheus_text():
+    """All metrics in the Prometheus text exposition format."""
+    with _lock:
+        stages = {k: tuple(v) for k, v in _stage_seconds.items()}
+        counters = dict(_counters)
+    lines = [f"# TYPE {PREFIX}_stage_seconds summary"]
+    for name, (seconds, n) in sorted(stages.items()):
+        lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{name}"}} {seconds:.6f}')
+        lines.append(f'{PREFIX}_stage_seconds_count{{stage="{name}"}} {n}')
+    for name, value in sorted(counters.items()):
+        lines.append(f"# TYPE {PREFIX}_{name} counter")
+        lines.append(f"{PREFIX}_{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path=None):
+    """Atomically rewrite the metrics file (``$EMERGENCY_METRICS_FILE``).
+
+    An ``OSError`` (missing directory, read-only or full disk) is logged the
+    first time it happens and otherwise ignored: instrumentation never fails
+    an analysis.
+    """
+    global _write_failed
+    path = path or METRICS_FILE
+    if not path:
+        return
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp_path, path)
+    except OSError:
+        if not _write_failed:
+            logger.exception("Could not write metrics to %s", path)
+        _write_failed = True
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    else:
+        _write_failed = False
+
+
+if ENABLED and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
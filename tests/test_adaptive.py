@@ -0,0 +1,35 @@
+"""The adaptive engine (``ANALYSIS_ENGINE=adaptive``) against the loop.
+
+A small, fixed version of ``benchmarks.adaptive``: on short encoded
+reference clips the early exit must reach the loop's decision without
+decoding more frames than the clip has, and stop early on a clear-cut clip.
+"""
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from benchmarks.synthetic import EXPECTED, write_clip  # noqa: E402
+from frame_sampler import SAMPLE_COUNT  # noqa: E402
+from video_analysis import analyze_file  # noqa: E402
+
+SIZE = (640, 360)
+FRAMES = 30
+
+
+@pytest.fixture(scope="module")
+def clips(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("clips")
+    return {scene: write_clip(str(directory / f"{scene}.mp4"), FRAMES, size=SIZE, scene=scene) for scene in EXPECTED}
+
+
+@pytest.mark.parametrize("scene", EXPECTED)
+def test_adaptive_engine_reaches_the_loop_decision(clips, scene):
+    loop = analyze_file(clips[scene], engine="loop", regions="frame")
+    adaptive = analyze_file(clips[scene], engine="adaptive", regions="frame")
+    assert adaptive["situation"] == loop["situation"] == EXPECTED[scene]
+    assert adaptive["frames_decoded"] <= FRAMES
+
+
+def test_adaptive_engine_stops_early_on_a_clear_clip(clips):
+    result = analyze_file(clips["flood"], engine="adaptive", regions="frame")
+    assert result["counters"]["frame_count"] < SAMPLE_COUNT
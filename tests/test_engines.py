@@ -0,0 +1,57 @@
+"""The stacked (batch) engine against the per-frame loop.
+
+A small, fixed version of ``benchmarks.engines``: both engines must give the
+same counters on every encoded reference and borderline clip, in both feature
+modes, at the default sample count and at one the stack has to grow past.
+"""
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from analysis_params import FEATURE_MODES  # noqa: E402
+from benchmarks.synthetic import BORDERLINE, EXPECTED, write_clip  # noqa: E402
+from frame_sampler import SAMPLE_COUNT, sample_frames  # noqa: E402
+from video_analysis import analyze_file, count_signals, count_signals_batch  # noqa: E402
+
+SIZE = (640, 360)
+FRAMES = 40
+
+
+@pytest.fixture(scope="module")
+def clips(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("clips")
+    return {
+        scene: write_clip(str(directory / f"{scene}.mp4"), FRAMES, size=SIZE, scene=scene)
+        for scene in [*EXPECTED, *BORDERLINE]
+    }
+
+
+def decoded(path, count):
+    cap = cv2.VideoCapture(path)
+    try:
+        return list(sample_frames(cap, count, path=path))
+    finally:
+        cap.release()
+
+
+@pytest.mark.parametrize("features", FEATURE_MODES)
+@pytest.mark.parametrize("scene", [*EXPECTED, *BORDERLINE])
+def test_batch_engine_counts_like_the_loop(clips, scene, features):
+    frames = decoded(clips[scene], SAMPLE_COUNT)
+    assert count_signals_batch(frames, SAMPLE_COUNT, features=features) == count_signals(frames, features=features)
+    # more frames than the stack was sized for
+    frames = decoded(clips[scene], FRAMES)
+    assert count_signals_batch(frames, SAMPLE_COUNT, features=features) == count_signals(frames, features=features)
+
+
+@pytest.mark.parametrize("frames", [0, 1, 2])
+def test_batch_engine_handles_short_clips(clips, frames):
+    sampled = decoded(clips["flood"], SAMPLE_COUNT)[:frames]
+    assert count_signals_batch(sampled) == count_signals(sampled)
+
+
+@pytest.mark.parametrize("scene", EXPECTED)
+def test_batch_engine_decides_like_the_loop(clips, scene):
+    loop = analyze_file(clips[scene], engine="loop", regions="frame")
+    batch = analyze_file(clips[scene], engine="batch", regions="frame")
+    assert batch["situation"] == loop["situation"] == EXPECTED[scene]
@@ -0,0 +1,59 @@
+"""Frame features and the loop engine against the original sidebar loop.
+
+A small, fixed version of ``benchmarks.features --check``: short synthetic
+clips are encoded once per run (the encoder's artifacts are what push the
+borderline scenes across a threshold) and every sampled frame must get the
+same water, fire, dark and motion flags as the original full-resolution loop.
+"""
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from benchmarks.features import legacy_counters, legacy_flags  # noqa: E402
+from benchmarks.synthetic import BORDERLINE, EXPECTED, write_clip  # noqa: E402
+from frame_features import FeatureExtractor, ThumbnailFeatureExtractor, frame_indicators  # noqa: E402
+from frame_sampler import sample_frames  # noqa: E402
+from video_analysis import classify, count_signals  # noqa: E402
+
+SIZE = (640, 360)
+FRAMES = 30
+
+
+@pytest.fixture(scope="module")
+def clips(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("clips")
+    return {
+        scene: write_clip(str(directory / f"{scene}.mp4"), FRAMES, size=SIZE, scene=scene)
+        for scene in [*EXPECTED, *BORDERLINE]
+    }
+
+
+def decoded(path):
+    cap = cv2.VideoCapture(path)
+    try:
+        return list(sample_frames(cap, path=path))
+    finally:
+        cap.release()
+
+
+@pytest.mark.parametrize("scene", [*EXPECTED, *BORDERLINE])
+def test_features_flag_every_frame_like_the_original_loop(clips, scene):
+    frames = decoded(clips[scene])
+    extract = FeatureExtractor()
+    flags = [tuple(bool(flag) for flag in frame_indicators(*extract(frame))) for frame in frames]
+    assert flags == legacy_flags(frames)
+
+
+@pytest.mark.parametrize("scene", EXPECTED)
+def test_thumbnail_features_decide_like_the_original_loop(clips, scene):
+    frames = decoded(clips[scene])
+    decision = classify(count_signals(frames, ThumbnailFeatureExtractor()))[0]
+    assert decision == classify(legacy_counters(frames))[0] == EXPECTED[scene]
+
+
+@pytest.mark.parametrize("scene", EXPECTED)
+def test_loop_engine_counts_like_the_original_loop(clips, scene):
+    frames = decoded(clips[scene])
+    counters = count_signals(frames)
+    assert counters == legacy_counters(frames)
+    assert classify(counters)[0] == EXPECTED[scene]
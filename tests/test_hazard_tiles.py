@@ -0,0 +1,38 @@
+"""Tiled hazard analysis (``ANALYSIS_REGIONS=tiles``).
+
+A small, fixed version of ``benchmarks.tiles``: short encoded clips of the
+reference scenes and of scenes with a hazard confined to part of the view
+must be classified as expected, with a hazard score in ``[0, 1]``.
+"""
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from benchmarks.synthetic import EXPECTED, LOCAL_EXPECTED, write_clip  # noqa: E402
+from video_analysis import analyze_file  # noqa: E402
+
+# At 320x180 the all-white checkerboard tiles of "shaking" read as water
+# reflections
+SIZE = (640, 360)
+FRAMES = 30
+
+
+@pytest.fixture(scope="module")
+def clips(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("clips")
+    return {
+        scene: write_clip(str(directory / f"{scene}.mp4"), FRAMES, size=SIZE, scene=scene)
+        for scene in [*EXPECTED, *LOCAL_EXPECTED]
+    }
+
+
+@pytest.mark.parametrize("scene", [*EXPECTED, *LOCAL_EXPECTED])
+def test_tiles_catch_whole_frame_and_local_hazards(clips, scene):
+    result = analyze_file(clips[scene], regions="tiles")
+    assert result["situation"] == {**EXPECTED, **LOCAL_EXPECTED}[scene]
+    assert 0.0 <= result["hazard_score"] <= 1.0
+
+
+@pytest.mark.parametrize("scene", LOCAL_EXPECTED)
+def test_whole_frame_averages_miss_local_hazards(clips, scene):
+    assert analyze_file(clips[scene], regions="frame", engine="loop")["situation"] == "general"
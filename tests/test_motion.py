@@ -0,0 +1,35 @@
+"""Flow motion (``ANALYSIS_MOTION=flow``) on the reference scenes.
+
+A small, fixed version of ``python -m benchmarks.suite --motion flow``: every
+reference scene, encoded once per run at the corpus' shortest length, must be
+classified as expected from camera shake and local motion, by the loop and
+the adaptive engine.
+"""
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from benchmarks.synthetic import EXPECTED, LENGTHS, write_clip  # noqa: E402
+from video_analysis import analyze_file  # noqa: E402
+
+SIZE = (640, 360)
+FRAMES = LENGTHS["5s"]
+
+
+@pytest.fixture(scope="module")
+def clips(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("clips")
+    return {scene: write_clip(str(directory / f"{scene}.mp4"), FRAMES, size=SIZE, scene=scene) for scene in EXPECTED}
+
+
+@pytest.mark.parametrize("engine", ["loop", "adaptive"])
+@pytest.mark.parametrize("scene", EXPECTED)
+def test_flow_motion_classifies_the_reference_scenes(clips, scene, engine):
+    result = analyze_file(clips[scene], engine=engine, motion="flow", regions="frame")
+    assert result["situation"] == EXPECTED[scene]
+
+
+def test_flow_motion_ignores_still_and_flat_scenes(clips):
+    for scene in ("calm", "dark"):
+        counters = analyze_file(clips[scene], engine="loop", motion="flow", regions="frame")["counters"]
+        assert counters["shake_frames"] == counters["local_motion_frames"] == 0
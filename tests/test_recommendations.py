@@ -0,0 +1,14 @@
+"""The rule table against the original sidebar branches (``benchmarks.plans``)."""
+import recommendations
+from benchmarks import plans
+
+
+def test_every_combination_matches_the_original_branches():
+    combinations, mismatches, _, _ = plans.compare()
+    assert combinations == len(recommendations.TABLE) * len(plans.PEOPLE)
+    assert mismatches == []
+
+
+def test_unknown_resources_are_ignored():
+    assert recommendations.recommend("fire", "Home", ["Phone", "Torch"]) == \
+        recommendations.recommend("fire", "Home", ["Phone"])
@@ -0,0 +1,51 @@
+"""Chunked uploads: the store's identities and the browser upload page."""
+import io
+import threading
+import urllib.request
+
+import pytest
+
+import upload_server
+from upload_store import PROGRESS_STEPS, UploadStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadStore(str(tmp_path))
+
+
+def test_progress_id_is_stable_while_chunks_arrive(store):
+    upload_id = store.create("clip.mp4", 1000)
+    file_ids, progress_ids = set(), set()
+    # nine chunks, all within the first tenth
+    for offset in range(0, 90, 10):
+        store.append(upload_id, offset, io.BytesIO(b"x" * 10), 10)
+        upload = store.get(upload_id)
+        file_ids.add(upload.file_id)
+        progress_ids.add(upload.progress_id)
+    assert len(file_ids) == 9
+    assert len(progress_ids) == 1
+
+
+def test_progress_id_changes_every_step_and_on_completion(store):
+    length = 10 * PROGRESS_STEPS
+    upload_id = store.create("clip.mp4", length)
+    ids = []
+    for offset in range(0, length, 10):
+        store.append(upload_id, offset, io.BytesIO(b"x" * 10), 10)
+        ids.append(store.get(upload_id).progress_id)
+    assert len(set(ids)) == PROGRESS_STEPS
+    assert store.get(upload_id).complete
+
+
+def test_upload_page_is_served(store):
+    server = upload_server.make_server(store, port=0, queue=object(), cache={})
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/uploads/") as response:
+            page = response.read().decode()
+        assert response.headers["Content-Type"].startswith("text/html")
+        assert 'method: "PATCH"' in page
+    finally:
+        server.shutdown()
+        server.server_close()
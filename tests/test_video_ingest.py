@@ -0,0 +1,48 @@
+"""Uploads are decoded from the in-memory stream, not a temp-file copy."""
+import io
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+import video_ingest  # noqa: E402
+from benchmarks.synthetic import write_clip  # noqa: E402
+from frame_sampler import sample_frames  # noqa: E402
+from video_analysis import count_signals  # noqa: E402
+
+# Long enough between samples that the sampler seeks instead of decoding
+# straight through, so most of the upload is never read
+FRAMES = 1500
+
+
+class CountingUpload(io.BytesIO):
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer):
+        n = super().readinto(buffer)
+        self.bytes_read += n
+        return n
+
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    path = tmp_path_factory.mktemp("clips") / "clip.mp4"
+    return write_clip(str(path), FRAMES, size=(640, 360), scene="gradient")
+
+
+def test_upload_is_streamed_without_a_temp_file(clip, monkeypatch):
+    def no_spool(*args, **kwargs):
+        raise AssertionError("upload was copied to a temp file")
+
+    monkeypatch.setattr(video_ingest, "spool_to_file", no_spool)
+    with open(clip, "rb") as f:
+        upload = CountingUpload(f.read())
+    with video_ingest.open_upload(upload, "clip.mp4") as cap:
+        counters = count_signals(sample_frames(cap, path="clip.mp4"))
+    assert counters["frame_count"] == 15
+    assert upload.bytes_read < len(upload.getvalue()) / 2
@@ -0,0 +1,126 @@
+"""Send a video to the chunked upload endpoint, resuming after failures.
+
+Reads the file chunk by chunk, so memory stays bounded for any size. When a
+request fails the client asks the server for the offset it holds and
+continues from there; an interrupted run can be resumed later with
+``--resume ID``. With ``--analyze`` a preliminary analysis of the part sent
+so far is printed after the first chunks, and the final one at the end.
+
+    python upload_client.py clip.mp4 --server http://host:8502
+    python upload_client.py clip.mp4 --server http://host:8502 --resume 3f2a...
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import sys
+import time
+import urllib.parse
+
+CHUNK_SIZE = 4 << 20
+RETRIES = 8
+PREVIEW_BYTES = 8 << 20
+
+
+class Client:
+    def __init__(self, server, timeout=60):
+        url = urllib.parse.urlsplit(server)
+        connection = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        self._connect = lambda: connection(url.netloc, timeout=timeout)
+        self.prefix = url.path.rstrip("/")
+
+    def request(self, method, path, body=None, headers=None):
+        conn = self._connect()
+        try:
+            conn.request(method, self.prefix + path, body, {"Tus-Resumable": "1.0.0", **(headers or {})})
+            response = conn.getresponse()
+            return response.status, response.headers, response.read()
+        finally:
+            conn.close()
+
+    def create(self, path):
+        name = base64.b64encode(os.path.basename(path).encode()).decode()
+        status, headers, body = self.request("POST", "/uploads", headers={
+            "Upload-Length": str(os.path.getsize(path)), "Upload-Metadata": f"filename {name}",
+        })
+        if status != 201:
+            raise RuntimeError(f"could not create upload: {status} {body.decode(errors='replace')}")
+        return headers["Location"].rstrip("/").rsplit("/", 1)[1]
+
+    def offset(self, upload_id):
+        status, headers, _ = self.request("HEAD", f"/uploads/{upload_id}")
+        if status != 200:
+            raise RuntimeError(f"unknown upload {upload_id} ({status})")
+        return int(headers["Upload-Offset"])
+
+    def send_chunk(self, upload_id, offset, chunk):
+        status, headers, body = self.request("PATCH", f"/uploads/{upload_id}", chunk, {
+            "Upload-Offset": str(offset), "Content-Type": "application/offset+octet-stream",
+        })
+        if status not in (204, 409):
+            raise RuntimeError(f"chunk rejected: {status} {body.decode(errors='replace')}")
+        return int(headers["Upload-Offset"])
+
+    def analysis(self, upload_id):
+        """Analysis of the part received so far; waits while the server is busy."""
+        for _ in range(RETRIES):
+            status, headers, body = self.request("GET", f"/uploads/{upload_id}/analysis")
+            if status != 503:
+                break
+            time.sleep(int(headers.get("Retry-After") or 5))
+        return json.loads(body)
+
+
+def upload(client, path, upload_id=None, chunk_size=CHUNK_SIZE, on_progress=None):
+    """Upload ``path`` (or resume ``upload_id``) and return the upload ID."""
+    upload_id = upload_id or client.create(path)
+    length = os.path.getsize(path)
+    offset = client.offset(upload_id)
+    failures = 0
+    with open(path, "rb") as f:
+        while offset < length:
+            f.seek(offset)
+            try:
+                offset = client.send_chunk(upload_id, offset, f.read(chunk_size))
+                failures = 0
+            except (OSError, http.client.HTTPException) as e:
+                failures += 1
+                if failures > RETRIES:
+                    raise
+                delay = min(30, 2 ** failures)
+                print(f"{e}; retrying in {delay} s", file=sys.stderr)
+                time.sleep(delay)
+                offset = client.offset(upload_id)
+            if on_progress is not None:
+                on_progress(upload_id, offset, length)
+    return upload_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("video")
+    parser.add_argument("--server", default="http://localhost:8502")
+    parser.add_argument("--resume", metavar="ID", help="continue an earlier upload")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="bytes per request")
+    parser.add_argument("--analyze", action="store_true", help="print preliminary and final analyses")
+    args = parser.parse_args()
+
+    client = Client(args.server)
+    previewed = False
+
+    def on_progress(upload_id, offset, length):
+        nonlocal previewed
+        print(f"{upload_id}: {offset}/{length} bytes ({offset / length:.0%})", file=sys.stderr)
+        if args.analyze and not previewed and PREVIEW_BYTES <= offset < length:
+            previewed = True
+            print(json.dumps(client.analysis(upload_id)))
+
+    upload_id = upload(client, args.video, args.resume, args.chunk_size, on_progress)
+    print(upload_id)
+    if args.analyze:
+        print(json.dumps(client.analysis(upload_id)))
+
+
+if __name__ == "__main__":
+    main()
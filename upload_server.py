@@ -0,0 +1,202 @@
+"""HTTP endpoint for chunked, resumable video uploads.
+
+A subset of the tus 1.0 core protocol over ``upload_store.UploadStore``:
+
+    POST  /uploads            Upload-Length, Upload-Metadata: filename <base64>
+                              -> 201, Location: /uploads/<id>
+    HEAD  /uploads/<id>       -> Upload-Offset, Upload-Length
+    PATCH /uploads/<id>       Upload-Offset, body = next chunk -> 204, Upload-Offset
+    GET   /uploads/<id>/analysis
+                              -> JSON analysis of the part received so far
+    GET   /uploads/           -> upload page: a browser client of the above
+                                 (``upload_page.html``)
+
+Analyses go through an ``analysis_queue.AnalysisQueue`` and an
+``analysis_cache.AnalysisCache`` (the app's own when started inside it), so
+they share its backpressure and results: ``503`` with ``Retry-After`` when
+the queue is full.
+
+There is no authentication: anyone who can reach the port can store videos
+(within the store's size and age limits, see ``upload_store``) and read
+their analyses. The server therefore only listens on the loopback interface
+unless ``UPLOAD_SERVER_HOST`` (or ``--host``) names another one; put an
+authenticating proxy in front before exposing it. The Railway deployment
+routes ``/uploads`` of the app's public port here (``Caddyfile``), which
+makes the endpoint as open as the app's own file uploader.
+
+Started inside the Streamlit process when ``UPLOAD_SERVER_PORT`` is set (see
+``app_fixed.py``), or on its own:
+
+    python upload_server.py --port 8502
+"""
+import argparse
+import base64
+import json
+import logging
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from analysis_cache import AnalysisCache
+from analysis_errors import AnalysisError, QueueFull
+from analysis_queue import AnalysisQueue
+from upload_store import OffsetMismatch, StoreFull, UnknownUpload, UploadError, UploadStore
+
+TUS_VERSION = "1.0.0"
+DEFAULT_PORT = int(os.environ.get("UPLOAD_SERVER_PORT") or 0) or 8502
+DEFAULT_HOST = os.environ.get("UPLOAD_SERVER_HOST") or "127.0.0.1"
+# Where users open the upload page (linked from the app's sidebar)
+PAGE_URL = os.environ.get("UPLOAD_PAGE_URL") or f"http://localhost:{DEFAULT_PORT}/uploads/"
+PAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "upload_page.html")
+# Seconds a client is asked to wait when the analysis queue is full
+RETRY_AFTER = 5
+
+logger = logging.getLogger("emergency.uploads")
+
+
+def parse_metadata(header):
+    """``Upload-Metadata`` (``key base64,key base64``) as a dict of str."""
+    metadata = {}
+    for pair in filter(None, (p.strip() for p in (header or "").split(","))):
+        key, _, value = pair.partition(" ")
+        metadata[key] = base64.b64decode(value).decode("utf-8") if value else ""
+    return metadata
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    # set by make_server
+    store = None
+    queue = None
+    cache = None
+
+    def _reply(self, status, headers=None, body=None):
+        self.send_response(status)
+        self.send_header("Tus-Resumable", TUS_VERSION)
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        payload = json.dumps(body).encode() if body is not None else b""
+        if payload:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _upload_id(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) < 2 or parts[0] != "uploads":
+            return None, None
+        return parts[1], parts[2] if len(parts) > 2 else None
+
+    def do_OPTIONS(self):
+        self._reply(204, {"Tus-Version": TUS_VERSION, "Tus-Extension": "creation"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/uploads":
+            return self._reply(404)
+        try:
+            length = int(self.headers.get("Upload-Length", ""))
+            name = parse_metadata(self.headers.get("Upload-Metadata")).get("filename", "")
+            upload_id = self.store.create(name, length)
+        except StoreFull as e:
+            return self._reply(507, body={"error": str(e)})
+        except (ValueError, UploadError) as e:
+            return self._reply(400, body={"error": str(e) or "Upload-Length required"})
+        self._reply(201, {"Location": f"/uploads/{upload_id}", "Upload-Offset": 0})
+
+    def do_HEAD(self):
+        upload_id, rest = self._upload_id()
+        if rest is not None:
+            return self._reply(404)
+        try:
+            upload = self.store.get(upload_id)
+        except UnknownUpload:
+            return self._reply(404)
+        self._reply(200, {"Upload-Offset": upload.received, "Upload-Length": upload.length})
+
+    def do_PATCH(self):
+        upload_id, _ = self._upload_id()
+        if self.headers.get("Content-Type") != "application/offset+octet-stream":
+            return self._reply(415)
+        try:
+            offset = int(self.headers.get("Upload-Offset", ""))
+            length = int(self.headers.get("Content-Length", ""))
+            new_offset = self.store.append(upload_id, offset, self.rfile, length)
+        except UnknownUpload:
+            return self._reply(404)
+        except OffsetMismatch as e:
+            return self._reply(409, {"Upload-Offset": e.offset}, {"error": str(e)})
+        except (ValueError, UploadError) as e:
+            return self._reply(400, body={"error": str(e) or "Upload-Offset and Content-Length required"})
+        self._reply(204, {"Upload-Offset": new_offset})
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/uploads":
+            return self._page()
+        upload_id, rest = self._upload_id()
+        if rest != "analysis":
+            return self._reply(404)
+        try:
+            upload = self.store.get(upload_id)
+        except UnknownUpload:
+            return self._reply(404)
+        try:
+            from analysis_runner import start_analysis
+
+            result = start_analysis(self.queue, self.cache, upload, upload.file_id).result()
+        except QueueFull as e:
+            return self._reply(503, {"Retry-After": RETRY_AFTER}, {"error": str(e)})
+        except AnalysisError as e:
+            # e.g. an MP4 whose index (moov atom) is at the end, not yet received
+            return self._reply(409, body={"error": str(e), "received": upload.received, "length": upload.length})
+        except Exception:
+            # e.g. a decoder error on a truncated part; the client still gets an answer
+            logger.exception("Analysis of upload %s failed", upload_id)
+            return self._reply(500, body={"error": "analysis failed"})
+        self._reply(200, body={**result, "partial": not upload.complete, "received": upload.received,
+                               "length": upload.length})
+
+    def _page(self):
+        with open(PAGE_PATH, "rb") as f:
+            page = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(store=None, port=DEFAULT_PORT, host=DEFAULT_HOST, queue=None, cache=None):
+    handler = type("Handler", (UploadHandler,), {
+        "store": store or UploadStore(),
+        "queue": queue if queue is not None else AnalysisQueue(),
+        # An empty cache is falsy (``len()``), so no ``or`` here
+        "cache": cache if cache is not None else AnalysisCache(directory=os.environ.get("ANALYSIS_CACHE_DIR")),
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_in_background(store=None, port=DEFAULT_PORT, host=DEFAULT_HOST, queue=None, cache=None):
+    """Serve on a daemon thread and return the server."""
+    server = make_server(store, port, host, queue, cache)
+    threading.Thread(target=server.serve_forever, name="upload-server", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--directory", help="where uploads are stored (default: $UPLOAD_DIR)")
+    args = parser.parse_args()
+    server = make_server(UploadStore(args.directory), args.port, args.host)
+    print(f"Accepting chunked uploads on http://{args.host}:{args.port}/uploads")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
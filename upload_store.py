@@ -0,0 +1,208 @@
+"""Chunked, resumable uploads written straight to disk.
+
+An upload is created with its total length, then its bytes are appended in
+chunks of any size, each one at the offset the store already holds. The
+offset is simply the size of the data file, so after a dropped connection
+(or a server restart) the client asks for it and sends only the rest. Chunks
+are copied to disk in fixed-size pieces, so memory use does not grow with
+the video. A partially received video can already be analysed: the frames
+in the part received so far are sampled.
+
+Disk use is bounded: the declared lengths of all stored uploads may not add
+up to more than ``UPLOAD_MAX_TOTAL_BYTES``, and uploads that received no data
+for ``UPLOAD_TTL`` seconds (stalled, or complete and already analysed) are
+deleted whenever a new one is created.
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+
+import telemetry
+
+CHUNK_SIZE = 1 << 20
+DEFAULT_DIRECTORY = os.environ.get("UPLOAD_DIR") or os.path.join(tempfile.gettempdir(), "emergency_uploads")
+MAX_UPLOAD_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES") or 0) or 2 << 30
+MAX_TOTAL_BYTES = int(os.environ.get("UPLOAD_MAX_TOTAL_BYTES") or 0) or 8 << 30
+UPLOAD_TTL = int(os.environ.get("UPLOAD_TTL") or 0) or 6 * 3600
+# ``StoredUpload.progress_id`` changes every 1/PROGRESS_STEPS of the length
+PROGRESS_STEPS = 10
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+
+_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadError(Exception):
+    """A chunked upload request that cannot be applied."""
+
+
+class UnknownUpload(UploadError):
+    """No upload with this ID (never created, or discarded)."""
+
+
+class StoreFull(UploadError):
+    """Accepting the upload would exceed the store's total size."""
+
+
+class OffsetMismatch(UploadError):
+    """A chunk did not start where the stored data ends."""
+
+    def __init__(self, offset):
+        super().__init__(f"upload is at offset {offset}")
+        self.offset = offset
+
+
+class StoredUpload:
+    """A (possibly partial) upload on disk, usable like a Streamlit upload.
+
+    ``file_id`` changes as data arrives, so analyses and cached results
+    belong to the prefix received at the time. ``progress_id`` only changes
+    every ``1 / PROGRESS_STEPS`` of the upload and when it completes, so a
+    page can keep a running analysis and its result while chunks arrive.
+    """
+
+    def __init__(self, upload_id, name, path, length, received):
+        self.upload_id = upload_id
+        self.name = name
+        self.path = path
+        self.length = length
+        self.received = received
+
+    @property
+    def complete(self):
+        return self.received >= self.length
+
+    @property
+    def size(self):
+        return self.received
+
+    @property
+    def file_id(self):
+        return f"stored:{self.upload_id}:{self.received}"
+
+    @property
+    def progress_id(self):
+        step = self.received * PROGRESS_STEPS // self.length if self.length else PROGRESS_STEPS
+        return f"stored:{self.upload_id}:{step}/{PROGRESS_STEPS}"
+
+
+class UploadStore:
+    """Upload data files plus a small JSON sidecar with name and length."""
+
+    def __init__(self, directory=None, max_bytes=MAX_UPLOAD_BYTES, max_total_bytes=MAX_TOTAL_BYTES,
+                 ttl=UPLOAD_TTL):
+        self.directory = directory or DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._upload_locks = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _paths(self, upload_id):
+        if not _ID.match(upload_id or ""):
+            raise UnknownUpload(upload_id)
+        base = os.path.join(self.directory, upload_id)
+        return base + ".part", base + ".json"
+
+    def _upload_lock(self, upload_id):
+        with self._lock:
+            return self._upload_locks.setdefault(upload_id, threading.Lock())
+
+    def create(self, name, length):
+        """Start an upload of ``length`` bytes and return its ID."""
+        ext = os.path.splitext(name or "")[1].lower()
+        if ext not in VIDEO_EXTENSIONS:
+            raise UploadError(f"unsupported file type: {ext or name!r}")
+        if not 0 < length <= self.max_bytes:
+            raise UploadError(f"upload length must be 1 to {self.max_bytes} bytes")
+        # One creation at a time, so concurrent uploads cannot both fit
+        with self._lock:
+            self.expire()
+            if self.reserved_bytes() + length > self.max_total_bytes:
+                raise StoreFull("not enough space for this upload right now")
+            upload_id = uuid.uuid4().hex
+            data_path, meta_path = self._paths(upload_id)
+            open(data_path, "wb").close()
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump({"name": os.path.basename(name), "length": length}, f)
+        return upload_id
+
+    def _uploads(self):
+        """``(upload_id, length, seconds since the last data)`` of every stored upload."""
+        now = time.time()
+        for entry in os.listdir(self.directory):
+            upload_id, ext = os.path.splitext(entry)
+            if ext != ".json" or not _ID.match(upload_id):
+                continue
+            data_path, meta_path = self._paths(upload_id)
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    length = json.load(f)["length"]
+                modified = max(os.path.getmtime(data_path), os.path.getmtime(meta_path))
+            except (OSError, ValueError, KeyError):
+                continue
+            yield upload_id, length, now - modified
+
+    def reserved_bytes(self):
+        """Sum of the declared lengths of all stored uploads."""
+        return sum(length for _, length, _ in self._uploads())
+
+    def expire(self):
+        """Delete uploads that received no data for ``ttl`` seconds; return how many."""
+        expired = []
+        for upload_id, _, age in self._uploads():
+            lock = self._upload_locks.get(upload_id)
+            # A chunk being received right now is not stale, however slow
+            if age > self.ttl and not (lock is not None and lock.locked()):
+                self.discard(upload_id)
+                expired.append(upload_id)
+        telemetry.count("uploads_expired_total", len(expired))
+        return len(expired)
+
+    def get(self, upload_id):
+        """The ``StoredUpload`` for ``upload_id``; raises ``UnknownUpload``."""
+        data_path, meta_path = self._paths(upload_id)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            received = os.path.getsize(data_path)
+        except FileNotFoundError:
+            raise UnknownUpload(upload_id) from None
+        return StoredUpload(upload_id, meta["name"], data_path, meta["length"], received)
+
+    def append(self, upload_id, offset, stream, length):
+        """Append ``length`` bytes read from ``stream`` at ``offset``.
+
+        Returns the new offset. If ``stream`` ends early (the connection
+        dropped) the bytes that did arrive are kept, so the client can resume
+        from the returned offset.
+        """
+        with self._upload_lock(upload_id):
+            upload = self.get(upload_id)
+            if offset != upload.received:
+                raise OffsetMismatch(upload.received)
+            if offset + length > upload.length:
+                raise UploadError(f"chunk ends past the upload length ({upload.length} bytes)")
+            written = 0
+            with open(upload.path, "ab") as f:
+                while written < length:
+                    chunk = stream.read(min(CHUNK_SIZE, length - written))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    written += len(chunk)
+            telemetry.count("chunk_bytes_total", written)
+            return offset + written
+
+    def discard(self, upload_id):
+        """Delete an upload's data and metadata."""
+        for path in self._paths(upload_id):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        self._upload_locks.pop(upload_id, None)
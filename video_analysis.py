@@ -0,0 +1,390 @@
+"""Situation detection from sampled video frames.
+
+Counts how many sampled frames look like water, fire, darkness or motion and
+maps those counters to a situation with the thresholds from the original
+sidebar analysis (5/4/8/10/4 out of 15 frames). With the ``"flow"`` motion
+mode, earthquake and accident are decided from camera shake and local motion
+measured on short-interval frame pairs (``motion.MotionAnalyzer``) instead.
+The ``"tiles"`` region mode evaluates the indicators per tile of an 8x8 grid
+(``hazard_tiles``) and adds a hazard heatmap to the result.
+"""
+import time
+
+import numpy as np
+
+from analysis_errors import AnalysisError
+from analysis_params import (
+    DEFAULT_ENGINE,
+    DEFAULT_FEATURES,
+    DEFAULT_MOTION,
+    DEFAULT_REGIONS,
+    ENGINES,
+    FEATURE_MODES,
+    MOTION_MODES,
+    REGION_MODES,
+)
+from decode_backend import open_capture, stream_info
+from frame_features import (
+    FeatureExtractor,
+    FrameStack,
+    batch_indicators,
+    frame_indicators,
+    make_extractor,
+    thumbnail,
+)
+import hazard_tiles
+from frame_sampler import SAMPLE_COUNT, has_unsampled_frames, sample_frames
+from motion import MotionAnalyzer
+from video_ingest import open_upload
+
+
+# (situation, counter, minimum frames, confidence) in priority order
+RULES = (
+    ("flood", "blue_frames", 5, "High"),            # 33% water patterns (muddy/blue)
+    ("fire", "red_frames", 4, "High"),              # 27% fire/red patterns
+    ("earthquake", "motion_frames", 8, "Medium"),   # 53% high motion
+    ("power_outage", "dark_frames", 10, "Medium"),  # 67% darkness
+    ("accident", "motion_frames", 4, "Medium"),     # Moderate motion
+)
+
+# The same rules with the motion split measured on frame pairs
+FLOW_RULES = (
+    RULES[0],
+    RULES[1],
+    ("earthquake", "shake_frames", 8, "Medium"),          # 53% camera shake
+    RULES[3],
+    ("accident", "local_motion_frames", 4, "Medium"),     # 27% moving objects
+)
+
+# Counters within this many frames of a rule minimum are "close": the
+# adaptive engine samples another pass instead of trusting them
+NEAR_THRESHOLD = 1
+MAX_PASSES = 2
+
+
+def new_counters(motion=None):
+    """Zeroed counters; the ``"flow"`` motion mode adds the pair counters."""
+    counters = {
+        "frame_count": 0,
+        "blue_frames": 0,
+        "red_frames": 0,
+        "dark_frames": 0,
+        "motion_frames": 0,
+    }
+    if (motion or DEFAULT_MOTION) == "flow":
+        counters["shake_frames"] = 0
+        counters["local_motion_frames"] = 0
+    return counters
+
+
+def add_frame(counters, item, extractor, analyzer=None):
+    """Add one sample to ``counters``.
+
+    ``item`` is a BGR frame, or a ``(frame, following)`` pair when an
+    ``analyzer`` (``motion.MotionAnalyzer``) is given.
+    """
+    if analyzer is not None:
+        frame, following = item
+        shaking, local_motion = analyzer(frame, following)
+        counters["shake_frames"] += shaking
+        counters["local_motion_frames"] += local_motion
+    else:
+        frame = item
+    water, fire, dark, moving = frame_indicators(*extractor(frame))
+    counters["blue_frames"] += water
+    counters["red_frames"] += fire
+    counters["dark_frames"] += dark
+    counters["motion_frames"] += moving
+    counters["frame_count"] += 1
+
+
+def count_signals(frames, extractor=None, progress=None, motion=None, features=None):
+    """Count indicator frames over an iterable of sampled BGR frames.
+
+    With ``motion="flow"`` the items are ``(frame, following)`` pairs (see
+    ``sample_frames(pairs=True)``). ``features`` is one of ``FEATURE_MODES``
+    (ignored when an ``extractor`` is given). ``progress`` is called with the
+    number of frames processed so far after each frame; an exception raised
+    from it aborts the analysis.
+    """
+    motion = motion or DEFAULT_MOTION
+    extractor = extractor or make_extractor(features)
+    analyzer = MotionAnalyzer() if motion == "flow" else None
+    counters = new_counters(motion)
+    for item in frames:
+        add_frame(counters, item, extractor, analyzer)
+        if progress is not None:
+            progress(counters["frame_count"])
+    return counters
+
+
+def _thumbnails(frames, counters, analyzer, progress):
+    """Thumbnails of every sampled frame and of its grey difference to the
+    previous one, computed as the frames are decoded.
+
+    The tiles are measured on the thumbnails only, so the full-frame colour
+    means are never computed.
+    """
+    extractor = FeatureExtractor()
+    thumbs, diffs = [], []
+    for item in frames:
+        if analyzer is not None:
+            item, following = item
+            shaking, local_motion = analyzer(item, following)
+            counters["shake_frames"] += shaking
+            counters["local_motion_frames"] += local_motion
+        thumbs.append(thumbnail(item))
+        diff = extractor.difference(item)
+        if diff is not None:
+            diffs.append(thumbnail(diff))
+        if progress is not None:
+            progress(len(thumbs))
+    counters["frame_count"] = len(thumbs)
+    return thumbs, diffs
+
+
+def _store_flags(counters, water, fire, dark, moving):
+    counters["blue_frames"] = int(np.count_nonzero(water))
+    counters["red_frames"] = int(np.count_nonzero(fire))
+    counters["dark_frames"] = int(np.count_nonzero(dark))
+    counters["motion_frames"] = int(np.count_nonzero(moving))
+
+
+def count_signals_batch(frames, count=SAMPLE_COUNT, progress=None, motion=None, features=None):
+    """``count_signals`` computed on all sampled frames at once.
+
+    Frames are stacked as they are decoded (``frame_features.FrameStack``,
+    sized for ``count`` samples), then colour, brightness and motion of the
+    whole stack are measured in a few OpenCV passes and every indicator is
+    evaluated with vectorised NumPy operations. Returns exactly the same
+    counters as ``count_signals`` (frame pairs are measured as they arrive;
+    their cost is fixed by the motion grid).
+    """
+    motion = motion or DEFAULT_MOTION
+    analyzer = MotionAnalyzer() if motion == "flow" else None
+    counters = new_counters(motion)
+    stack = FrameStack(count, features)
+    for item in frames:
+        if analyzer is not None:
+            item, following = item
+            shaking, local_motion = analyzer(item, following)
+            counters["shake_frames"] += shaking
+            counters["local_motion_frames"] += local_motion
+        stack.add(item)
+        if progress is not None:
+            progress(stack.count)
+    counters["frame_count"] = stack.count
+    if stack.count:
+        _store_flags(counters, *batch_indicators(*stack.features()))
+    return counters
+
+
+def count_signals_tiles(frames, progress=None, motion=None):
+    """``count_signals`` with the indicators evaluated per tile.
+
+    Returns ``(counters, tiles)``: a frame counts as water, fire or motion
+    when enough of its tiles do (see ``hazard_tiles``), and ``tiles`` holds
+    the ``heatmap`` (rows of floats), the ``hazard_score`` and a
+    ``preview_jpeg`` of the most hazardous sample, or is ``None`` when no
+    frame was decoded.
+    """
+    motion = motion or DEFAULT_MOTION
+    analyzer = MotionAnalyzer() if motion == "flow" else None
+    counters = new_counters(motion)
+    thumbs, diffs = _thumbnails(frames, counters, analyzer, progress)
+    if not thumbs:
+        return counters, None
+    height, width = thumbs[0].shape[:2]
+    diffs = np.array(diffs, dtype=np.uint8).reshape(-1, height, width)
+    *flags, heatmap, peak = hazard_tiles.analyze_tiles(np.stack(thumbs), diffs)
+    _store_flags(counters, *flags)
+    return counters, {
+        "heatmap": heatmap.round(3).tolist(),
+        "hazard_score": hazard_tiles.hazard_score(heatmap),
+        "preview_jpeg": hazard_tiles.encode_preview(thumbs[peak]),
+    }
+
+
+def classify(counters):
+    """Return ``(situation, confidence)`` for a set of counters.
+
+    The rule minimums are out of ``SAMPLE_COUNT`` frames; when more frames
+    were sampled they scale proportionally (fewer keep the absolute minimum,
+    as the original 15-frame loop did for short clips).
+    """
+    scale = max(counters["frame_count"], SAMPLE_COUNT)
+    for situation, counter, minimum, confidence in _rules_for(counters):
+        if counters[counter] * SAMPLE_COUNT >= minimum * scale:
+            return situation, confidence
+    return "general", "Medium"
+
+
+def _rules_for(counters):
+    return FLOW_RULES if "shake_frames" in counters else RULES
+
+
+def _needed(minimum, frame_count):
+    return minimum * max(frame_count, SAMPLE_COUNT) / SAMPLE_COUNT
+
+
+def settled(counters, remaining, planned):
+    """The final ``(situation, confidence)`` if already certain, else ``None``.
+
+    Certain means no outcome of the ``remaining`` frames (out of ``planned``)
+    can change the decision or leave a counter close to a rule minimum.
+    """
+    for situation, counter, minimum, confidence in _rules_for(counters):
+        needed = _needed(minimum, planned)
+        if counters[counter] >= needed + NEAR_THRESHOLD:
+            return situation, confidence
+        if counters[counter] + remaining >= needed - NEAR_THRESHOLD:
+            return None
+    return "general", "Medium"
+
+
+def near_threshold(counters):
+    """Whether the decision hinges on a counter close to a rule minimum."""
+    for _, counter, minimum, _ in _rules_for(counters):
+        needed = _needed(minimum, counters["frame_count"])
+        if needed - NEAR_THRESHOLD <= counters[counter] < needed + NEAR_THRESHOLD:
+            return True
+        if counters[counter] >= needed:
+            return False
+    return False
+
+
+def count_signals_adaptive(cap, count=SAMPLE_COUNT, strategy=None, path=None, progress=None, stats=None,
+                           motion=None, features=None):
+    """``count_signals`` that decodes only as many frames as it needs.
+
+    Frames are sampled in time order and decoding stops as soon as the
+    decision is ``settled``. If a full pass ends with a counter close to a
+    rule minimum, another pass samples the frames half way between the
+    previous samples (the minimums then scale with the larger sample count).
+    ``progress`` is called with the frames sampled so far and the number
+    now planned, which grows when another pass starts.
+    """
+    motion = motion or DEFAULT_MOTION
+    counters = new_counters(motion)
+    planned = 0
+    for n_pass in range(MAX_PASSES):
+        if n_pass and not (near_threshold(counters) and has_unsampled_frames(cap, count)):
+            break
+        planned = counters["frame_count"] + count
+        # Motion compares consecutive samples within one pass only
+        extractor = make_extractor(features)
+        analyzer = MotionAnalyzer() if motion == "flow" else None
+        frames = sample_frames(
+            cap, count, strategy, path=path, offset=n_pass / MAX_PASSES, stats=stats, pairs=analyzer is not None
+        )
+        for item in frames:
+            add_frame(counters, item, extractor, analyzer)
+            if progress is not None:
+                progress(counters["frame_count"], planned)
+            if settled(counters, planned - counters["frame_count"], planned) is not None:
+                return counters
+    return counters
+
+
+def analyze_capture(cap, count=SAMPLE_COUNT, strategy=None, path=None, progress=None, engine=None, motion=None,
+                    regions=None, features=None):
+    """Sample an open capture, count the indicator frames and classify them.
+
+    Returns a JSON-serialisable dict with the ``counters``, ``situation``,
+    ``confidence``, the number of ``frames_decoded``, the container's
+    ``stream`` metadata and per-stage ``timings`` in milliseconds. Raises ``AnalysisError`` if the video cannot
+    be opened or yields no frames. ``engine`` is ``"adaptive"`` (early exit,
+    the default or ``$ANALYSIS_ENGINE``), ``"batch"`` (every sample, stacked
+    and measured at once) or ``"loop"`` (every sample, frame by frame). ``motion`` is one of ``MOTION_MODES``
+    (default ``$ANALYSIS_MOTION`` or ``"diff"``) and ``features`` one of
+    ``FEATURE_MODES`` (default ``$ANALYSIS_FEATURES`` or ``"full"``). With
+    ``regions="tiles"``
+    (default ``$ANALYSIS_REGIONS``) all samples are evaluated per tile in
+    one batch, whatever the engine, and the result also has a ``heatmap``,
+    ``hazard_score`` and ``preview_jpeg``.
+    """
+    engine = engine or DEFAULT_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown analysis engine: {engine!r}")
+    motion = motion or DEFAULT_MOTION
+    if motion not in MOTION_MODES:
+        raise ValueError(f"Unknown motion mode: {motion!r}")
+    pairs = motion == "flow"
+    regions = regions or DEFAULT_REGIONS
+    if regions not in REGION_MODES:
+        raise ValueError(f"Unknown region mode: {regions!r}")
+    features = features or DEFAULT_FEATURES
+    if features not in FEATURE_MODES:
+        raise ValueError(f"Unknown feature mode: {features!r}")
+    if not cap.isOpened():
+        raise AnalysisError("could not open video")
+    start = time.perf_counter()
+    stream = stream_info(cap)
+    stats = {"frames_decoded": 0, "decode_ms": 0.0}
+    tiles = None
+    if regions == "tiles":
+        frames = sample_frames(cap, count, strategy, path=path, stats=stats, pairs=pairs)
+        counters, tiles = count_signals_tiles(frames, progress=progress, motion=motion)
+    elif engine == "adaptive":
+        counters = count_signals_adaptive(
+            cap, count, strategy, path=path, progress=progress, stats=stats, motion=motion, features=features
+        )
+    elif engine == "batch":
+        frames = sample_frames(cap, count, strategy, path=path, stats=stats, pairs=pairs)
+        counters = count_signals_batch(frames, count, progress=progress, motion=motion, features=features)
+    else:
+        frames = sample_frames(cap, count, strategy, path=path, stats=stats, pairs=pairs)
+        counters = count_signals(frames, progress=progress, motion=motion, features=features)
+    if counters["frame_count"] == 0:
+        raise AnalysisError("no frames could be decoded")
+    situation, confidence = classify(counters)
+    analyze_ms = (time.perf_counter() - start) * 1000
+    return {
+        "counters": counters,
+        "situation": situation,
+        "confidence": confidence,
+        "frames_decoded": stats["frames_decoded"],
+        "stream": stream,
+        "timings": {
+            "analyze_ms": analyze_ms,
+            "decode_ms": stats["decode_ms"],
+            "features_ms": analyze_ms - stats["decode_ms"],
+        },
+        **(tiles or {}),
+    }
+
+
+def analyze_upload(upload, count=SAMPLE_COUNT, strategy=None, name=None, progress=None, engine=None, motion=None,
+                   regions=None, backend=None, features=None):
+    """``analyze_capture`` for an uploaded file-like object.
+
+    ``backend`` is one of ``decode_backend.BACKENDS`` (default
+    ``$DECODE_BACKEND``).
+    """
+    name = name or getattr(upload, "name", None)
+    start = time.perf_counter()
+    with open_upload(upload, name, backend) as cap:
+        open_ms = (time.perf_counter() - start) * 1000
+        result = analyze_capture(
+            cap, count, strategy, path=name, progress=progress, engine=engine, motion=motion, regions=regions,
+            features=features,
+        )
+    result["timings"]["open_ms"] = open_ms
+    return result
+
+
+def analyze_file(path, count=SAMPLE_COUNT, strategy=None, engine=None, motion=None, progress=None, regions=None,
+                 backend=None, features=None):
+    """``analyze_capture`` for a video file on disk."""
+    start = time.perf_counter()
+    cap = open_capture(path, backend)
+    open_ms = (time.perf_counter() - start) * 1000
+    try:
+        result = analyze_capture(
+            cap, count, strategy, path=path, progress=progress, engine=engine, motion=motion, regions=regions,
+            features=features,
+        )
+    finally:
+        cap.release()
+    result["timings"]["open_ms"] = open_ms
+    return result
@@ -0,0 +1,65 @@
+"""Opening uploaded videos for analysis without buffering them twice.
+
+Streamlit already holds an upload in memory as a file-like object. OpenCV
+4.11+ (and PyAV) can decode straight from such a stream, so FFmpeg only reads
+the bytes it needs for the sampled frames and no temp file is written. Older
+OpenCV builds fall back to copying the upload to a temp file in fixed-size
+chunks instead of ``read()``-ing it whole.
+"""
+import contextlib
+import os
+import shutil
+import tempfile
+
+import telemetry
+from decode_backend import open_capture
+
+CHUNK_SIZE = 1 << 20
+
+
+def stream_capture(stream, backend=None):
+    """Open a capture that reads from ``stream``, or ``None`` if unsupported."""
+    cap = open_capture(stream, backend)
+    if cap is None:
+        return None
+    if cap.isOpened():
+        return cap
+    cap.release()
+    return None
+
+
+def spool_to_file(stream, suffix=".mp4"):
+    """Copy ``stream`` to a new temp file chunk by chunk and return its path."""
+    with telemetry.stage("temp_file_write"), tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        try:
+            shutil.copyfileobj(stream, tmp_file, CHUNK_SIZE)
+        except BaseException:
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+        telemetry.count("spooled_bytes_total", tmp_file.tell())
+    return tmp_file.name
+
+
+@contextlib.contextmanager
+def open_upload(upload, name=None, backend=None):
+    """Yield a ``cv2.VideoCapture`` for an uploaded file-like object.
+
+    The capture is always released and any temp file removed on exit, even
+    when the analysis inside the ``with`` block raises. ``backend`` is one
+    of ``decode_backend.BACKENDS``.
+    """
+    name = name or getattr(upload, "name", "") or ""
+    upload.seek(0)
+    cap = stream_capture(upload, backend)
+    video_path = None
+    if cap is None:
+        upload.seek(0)
+        video_path = spool_to_file(upload, os.path.splitext(name)[1] or ".mp4")
+        cap = open_capture(video_path, backend)
+    try:
+        yield cap
+    finally:
+        cap.release()
+        if video_path is not None:
+            os.unlink(video_path)
@@ -0,0 +1,67 @@
+"""Warm heavy dependencies once per process, off the request path.
+
+Importing OpenCV and NumPy (and loading OpenCV's FFmpeg backend) takes long
+enough to be felt when it happens inside the first "Analyze Video" click
+after a deploy. ``start()`` does it on a daemon thread as soon as the entry
+script first runs; later calls are no-ops. ``compiled()`` likewise keeps the
+page script's code object, so a rerun only executes it.
+"""
+import importlib
+import os
+import threading
+import time
+
+MODULES = ("numpy", "cv2", "frame_sampler", "frame_features", "video_analysis", "analysis_runner")
+
+_lock = threading.Lock()
+_thread = None
+ready = threading.Event()
+timings = {}  # module -> import ms, plus "total"
+errors = {}   # module -> repr of the import error
+_code = {}    # script path -> (mtime_ns, code object)
+
+
+def _warm():
+    start = time.perf_counter()
+    for name in MODULES:
+        module_start = time.perf_counter()
+        try:
+            module = importlib.import_module(name)
+            if name == "cv2":
+                # Instantiating a capture loads the video I/O plugins
+                module.VideoCapture().release()
+        except Exception as e:
+            errors[name] = repr(e)
+        timings[name] = (time.perf_counter() - module_start) * 1000
+    timings["total"] = (time.perf_counter() - start) * 1000
+    ready.set()
+
+
+def start():
+    """Start warming in the background (once per process)."""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_warm, name="warmup", daemon=True)
+            _thread.start()
+    return _thread
+
+
+def wait(timeout=None):
+    """Block until warming finished; returns ``False`` on timeout."""
+    return ready.wait(timeout)
+
+
+def compiled(path):
+    """The code object of the script at ``path``, compiled once per process.
+
+    It is compiled again only when the file changes, so edits still show up
+    on the next rerun during development.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        cached = _code.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, "rb") as f:
+                cached = _code[path] = (mtime, compile(f.read(), path, "exec"))
+    return cached[1]